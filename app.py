@@ -44,6 +44,13 @@ from scraper.mobilegoo import MobileGooScraper
 from scraper.amazon import AmazonRenewedScraper
 from scraper.flipkart import FlipkartScraper
 from scraper.quikr import QuikrScraper
+from scraper.orchestrator import run_scrapers
+from scraper.pipeline import normalization_cache_stats
+from utils.comparison import compare_to_baseline, best_price_suggestions
+from database.cache import (
+    frame_cache, cached_device_query, cached_device_page, cached_device_count, cached_brands,
+    cached_date_bounds,
+)
 import pandas as pd
 import plotly.express as px
 from datetime import datetime
@@ -51,7 +58,7 @@ from apscheduler.schedulers.background import BackgroundScheduler
 import time
 import os
 from config import USERS
-from database.operations import get_db_manager, add_device_prices, get_all_data, to_dataframe
+from database.operations import get_db_manager, add_device_prices
 from database.models import Base
 
 # Initialize database manager
@@ -96,31 +103,31 @@ st.markdown("Track and compare prices across refurbished device marketplaces")
 # Scraper functions
 def run_cashify_scraper():
     scraper = CashifyScraper()
-    return scraper.scrape()
+    return scraper.scrape_iter()
 
 def run_maple_scraper():
     scraper = MapleScraper()
-    return scraper.scrape()
+    return scraper.scrape_iter()
 
 def run_refit_scraper():
     scraper = RefitScraper()
-    return scraper.scrape()
+    return scraper.scrape_iter()
     
 def run_mobilegoo_scraper():    
     scraper = MobileGooScraper()
-    return scraper.scrape()
+    return scraper.scrape_iter()
     
 def run_amazon_scraper():    
     scraper = AmazonRenewedScraper()
-    return scraper.scrape()
+    return scraper.scrape_iter()
     
 def run_flipkart_scraper():
     scraper = FlipkartScraper()
-    return scraper.scrape()
+    return scraper.scrape_iter()
 
 def run_quikr_scraper():
     scraper = QuikrScraper()
-    return scraper.scrape()
+    return scraper.scrape_iter()
     
 SCRAPERS = {
     "Cashify": run_cashify_scraper,
@@ -134,18 +141,20 @@ SCRAPERS = {
 
 def run_all_scrapers():
     with st.spinner("Running scrapers... This may take a few minutes"):
-        cashify_devices = run_cashify_scraper()
-        maple_devices = run_maple_scraper()
-        refit_devices = run_refit_scraper()
-        mobilegoo_devices = run_mobilegoo_scraper()
-        amazon_devices = run_amazon_scraper()
-        flipkart_devices = run_flipkart_scraper()
-        quikr_devices = run_quikr_scraper()
-        
-        all_devices = cashify_devices + maple_devices + refit_devices + mobilegoo_devices + amazon_devices + flipkart_devices + quikr_devices
-        added_count = db_ops.add_device_prices(all_devices)
-        
+        summary = run_scrapers(
+            SCRAPERS,
+            on_batch=lambda name, devices: db_ops.add_device_prices(devices),
+        )
+
+        added_count = sum(result["added"] for result in summary.values())
+        failed = [name for name, result in summary.items() if result["status"] in ("failed", "timeout")]
+        skipped = [f"{name} ({result['error']})" for name, result in summary.items() if result["status"] == "skipped"]
+
         st.success(f"Added {added_count} new records!")
+        if failed:
+            st.warning(f"Scrapers failed or timed out: {', '.join(failed)}")
+        if skipped:
+            st.info(f"Skipped: {', '.join(skipped)}")
         time.sleep(2)
         st.rerun()
 
@@ -156,8 +165,9 @@ if 'scheduler_started' not in st.session_state:
     scheduler.start()
     st.session_state.scheduler_started = True
     
-all_data = db_ops.get_all_data()
-df = db_ops.to_dataframe(all_data)
+# Shared across reruns and sessions; reloaded only when new rows arrive
+min_date, max_date = cached_date_bounds()
+has_data = max_date is not None
 
 
 # Sidebar controls
@@ -180,9 +190,15 @@ with st.sidebar:
             if run:
                 # Render spinner below
                 with st.spinner(f"Running {name}…"):
-                    devices = fn()
-                    added_count = db_ops.add_device_prices(devices)
-                    st.success(f"✅ Added {added_count} new records from {name}")
+                    # A manual run goes ahead even if the source's circuit is open
+                    result = run_scrapers(
+                        {name: fn},
+                        on_batch=lambda _, devices: db_ops.add_device_prices(devices),
+                        force=True,
+                    )[name]
+                    st.success(f"✅ Added {result['added']} new records from {name}")
+                    if result["status"] != "ok":
+                        st.warning(f"{name} {result['status']}: {result['error']}")
                     time.sleep(2)
                     st.rerun()
 
@@ -199,8 +215,8 @@ with st.sidebar:
     )
     
     # Brand filter
-    if not df.empty and 'brand' in df.columns:
-        unique_brands = ["All"] + sorted(df['brand'].unique().tolist())
+    if has_data:
+        unique_brands = ["All"] + cached_brands()
     else:
         unique_brands = ["All"]
         st.warning("No device data found in the database. Please run scrapers first.")
@@ -211,8 +227,8 @@ with st.sidebar:
     selected_condition = st.selectbox("Filter by Condition", conditions)
     
     # Date filter
-    min_date = df['date_scraped'].min() if not df.empty else datetime.now()
-    max_date = df['date_scraped'].max() if not df.empty else datetime.now()
+    min_date = min_date or datetime.now()
+    max_date = max_date or datetime.now()
     date_range = st.date_input(
         "Date Range", 
         value=(min_date, max_date),
@@ -221,22 +237,16 @@ with st.sidebar:
     )
     
     
-    # Apply filters early
-    filtered_df = df.copy()
-    if not pd.api.types.is_datetime64_any_dtype(filtered_df['date_scraped']):
-        filtered_df['date_scraped'] = pd.to_datetime(filtered_df['date_scraped'], errors='coerce')
-    if selected_brand != "All":
-        filtered_df = filtered_df[filtered_df['brand'] == selected_brand]
-    if selected_condition != "All":
-        filtered_df = filtered_df[filtered_df['condition'] == selected_condition]
-    if sources:
-        filtered_df = filtered_df[filtered_df['source'].isin(sources)]
-    if len(date_range) == 2:
-        start_date, end_date = date_range
-        filtered_df = filtered_df[
-            (filtered_df['date_scraped'].dt.date >= start_date) &
-            (filtered_df['date_scraped'].dt.date <= end_date)
-        ]
+    # One SQL query for the selected filters, shared by the export and the main views
+    start_date, end_date = date_range if len(date_range) == 2 else (None, None)
+    filters = dict(
+        brand=selected_brand,
+        condition=selected_condition,
+        sources=sources,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    filtered_df = cached_device_query(**filters)
     st.markdown("---")
     # Export and Download CSV 
     if st.button("Export to CSV"):
@@ -275,11 +285,26 @@ if st.sidebar.checkbox("Show Database Info"):
             st.table(sample_data)
     finally:
         session.close()
+if st.sidebar.checkbox("Show Cache Stats"):
+    stats = frame_cache.stats()
+    st.sidebar.write(
+        f"Hits: {stats['hits']} · Misses: {stats['misses']} ({stats['hit_rate']:.0%} hit rate)  \n"
+        f"Cached frames: {stats['entries']} · {stats['memory_mb']:.1f} MB · {stats['evictions']} evicted  \n"
+        f"Version checks: {stats['version_checks']} · Data version: {stats['version']}"
+    )
+    if stats['last_load_seconds'] is not None:
+        st.sidebar.write(f"Last load: {stats['last_load_seconds'] * 1000:.0f} ms")
+    # Parsing runs in parser processes; their counts come back with each parse
+    for name, counts in normalization_cache_stats().items():
+        lookups = counts['hits'] + counts['misses']
+        rate = counts['hits'] / lookups if lookups else 0.0
+        st.sidebar.write(f"{name}: {counts['hits']} hits · {counts['misses']} misses ({rate:.0%}) · {counts['size']} cached")
 if st.sidebar.button("Reset Database"):
     session = db_manager.get_session()
     try:
         Base.metadata.drop_all(db_manager.engine)
         Base.metadata.create_all(db_manager.engine)
+        frame_cache.invalidate()
         st.sidebar.success("Database reset complete")
     except Exception as e:
         st.sidebar.error(f"Reset failed: {str(e)}")
@@ -289,80 +314,94 @@ if st.sidebar.button("Reset Database"):
     st.rerun()
     
 # Main dashboard
-if not df.empty:
-    # Apply filters
-    if selected_brand != "All":
-        df = df[df['brand'] == selected_brand]
-    if selected_condition != "All":
-        df = df[df['condition'] == selected_condition]
-    if sources:
-        df = df[df['source'].isin(sources)]
-    if len(date_range) == 2:
-        start_date, end_date = date_range
-        df = df[(df['date_scraped'].dt.date >= start_date) & 
-                (df['date_scraped'].dt.date <= end_date)]
-    
-    # Display data
+if has_data:
+    df = filtered_df
+
+    # Display data, one page at a time straight from the database
     st.header("Latest Prices")
-    st.dataframe(df.sort_values('date_scraped', ascending=False))
+    col1, col2, col3 = st.columns(3)
+    sort_by = col1.selectbox(
+        "Sort by", ['date_scraped', 'price', 'brand', 'model', 'source', 'condition'], key="latest_sort"
+    )
+    descending = col2.selectbox("Order", ["Descending", "Ascending"], key="latest_order") == "Descending"
+    page_size = col3.selectbox("Rows per page", [25, 50, 100, 250], index=1, key="latest_page_size")
+
+    total_rows = cached_device_count(**filters)
+    page_count = max(1, -(-total_rows // page_size))
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key="latest_page")
+    latest_page = cached_device_page(
+        sort_by=sort_by,
+        descending=descending,
+        page=page,
+        page_size=page_size,
+        **filters,
+    )
+    st.dataframe(latest_page, hide_index=True, use_container_width=True)
+    st.caption(f"Page {page} of {page_count} · {total_rows} rows")
     
     # Price analysis
     st.header("Price Analysis")
     
-    # Comparison with Maple
-    if 'Maple' in sources:
-        st.subheader("Price Comparison vs Maple")
-        
-        # Get Maple prices as baseline
-        maple_prices = df[df['source'] == 'Maple']
-        
-        # Merge with other prices
-        comparison_df = pd.merge(
-            df[df['source'] != 'Maple'],
-            maple_prices[['brand', 'model', 'price']],
-            on=['brand', 'model'],
-            suffixes=('', '_maple'),
-            how='inner'
+    # Comparison against a baseline source (Maple by default)
+    baseline_options = sorted(df['source'].unique())
+    if len(baseline_options) > 1:
+        col1, col2 = st.columns(2)
+        baseline = col1.selectbox(
+            "Compare against",
+            baseline_options,
+            index=baseline_options.index("Maple") if "Maple" in baseline_options else 0,
         )
+        price_stat = col2.selectbox("Price", ["latest", "min", "median"])
+        st.subheader(f"Price Comparison vs {baseline}")
+
+        # Each source is reduced to one row per device before joining
+        comparison_df = compare_to_baseline(df, baseline=baseline, stat=price_stat)
 
-        
         if not comparison_df.empty:
-            # Calculate percentage difference
-            comparison_df['percent_diff'] = (
-            (comparison_df['price'] - comparison_df['price_maple']) / 
-            comparison_df['price_maple'] * 100
-            ).round(2)
-            
-            # Format results
-            comparison_df = comparison_df[[
-                'id','source', 'brand', 'model', 'condition', 
-                'price', 'price_maple', 'percent_diff'
-            ]]
-            
             # Display comparison table
-            st.dataframe(comparison_df.sort_values('percent_diff', ascending=False).reset_index(drop=True))
+            st.dataframe(
+                comparison_df[[
+                    'source', 'brand', 'model', 'condition', 'baseline_condition',
+                    'price', 'baseline_price', 'percent_diff',
+                ]].sort_values('percent_diff', ascending=False).reset_index(drop=True)
+            )
             
             # Best price suggestions
             st.subheader("Best Price Suggestions")
             
-            # Find the best offer for each device
-            best_offers = comparison_df.loc[
-                comparison_df.groupby(['brand', 'model', 'condition'])['percent_diff'].idxmax()
-            ]
-            
-            for _, row in best_offers.iterrows():
-                if row['percent_diff'] > 0:
-                    st.success(
-                        f"Sell **{row['brand']} {row['model']}** ({row['condition']}) to "
-                        f"**{row['source']}** - **{row['percent_diff']:.1f}%** higher than Maple "
-                        f"(₹{row['price']} vs ₹{row['price_maple']})"
-                    )
-                else:
-                    st.warning(
-                        f"Maple offers better price for **{row['brand']} {row['model']}** "
-                        f"({row['condition']}) by **{abs(row['percent_diff']):.1f}%**"
-                    )
-            
+            suggestions = best_price_suggestions(comparison_df, baseline)
+            better_elsewhere = int((suggestions['sell_to'] != baseline).sum())
+            st.caption(
+                f"{better_elsewhere} of {len(suggestions)} devices fetch more elsewhere than at {baseline}"
+            )
+
+            col1, col2, col3 = st.columns(3)
+            sort_by = col1.selectbox(
+                "Sort by", ["percent_diff", "brand", "model", "best_source", "price"], key="suggestion_sort"
+            )
+            page_size = col2.selectbox("Rows per page", [25, 50, 100, 250], key="suggestion_page_size")
+            top_n = col3.number_input("Highlight top", min_value=0, value=10, step=5, key="suggestion_top_n")
+
+            suggestions = suggestions.sort_values(sort_by, ascending=sort_by != "percent_diff", kind="stable")
+            top_index = suggestions[suggestions['percent_diff'] > 0].nlargest(int(top_n), 'percent_diff').index
+
+            page_count = max(1, -(-len(suggestions) // page_size))
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key="suggestion_page")
+            page_df = suggestions.iloc[(page - 1) * page_size:page * page_size]
+
+            def highlight_top(frame):
+                styles = pd.DataFrame('', index=frame.index, columns=frame.columns)
+                styles.loc[frame.index.isin(top_index), :] = 'background-color: #d4edda'
+                return styles
+
+            # Only the visible page is styled and sent to the browser
+            st.dataframe(
+                page_df.style.apply(highlight_top, axis=None).format({'percent_diff': '{:+.1f}%'}),
+                hide_index=True,
+                use_container_width=True,
+            )
+            st.caption(f"Page {page} of {page_count} · top {len(top_index)} offers highlighted")
+
             # Visualization
             st.subheader("Price Comparison Chart")
             fig = px.bar(
@@ -371,16 +410,16 @@ if not df.empty:
                 y='percent_diff',
                 color='source',
                 barmode='group',
-                title='Price Difference vs Maple (%)',
+                title=f'Price Difference vs {baseline} (%)',
                 labels={'percent_diff': 'Price Difference (%)', 'model': 'Device Model'},
-                hover_data=['price', 'price_maple']
+                hover_data=['price', 'baseline_price', 'baseline_condition']
             )
             fig.update_layout(xaxis_tickangle=-45)
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.warning("No comparable data found. Try expanding your filters.")
     else:
-        st.warning("Include Maple in your sources to enable price comparisons")
+        st.warning("Select at least two sources with data to enable price comparisons")
 else:
     st.warning("No data available. Run scrapers to collect pricing data.")
 
@@ -6,29 +6,111 @@ load_dotenv()
 # Database configuration
 DATABASE_URL = "sqlite:///create_a_db_file_in_root"
 
+# SQLite connection profile (ignored for other databases); "tuned": False
+# falls back to SQLAlchemy's defaults
+SQLITE_CONFIG = {
+    "tuned": True,
+    "journal_mode": "WAL",        # dashboard reads don't block scraper writes
+    "synchronous": "NORMAL",
+    "cache_size_mb": 64,
+    "mmap_size_mb": 256,
+    "busy_timeout_ms": 5000,
+    "pool_size": 5,
+    "max_overflow": 10,
+    "checkpoint_interval": 300,   # seconds between WAL checkpoints after writes
+    "optimize_interval": 3600,    # seconds between PRAGMA optimize (incremental ANALYZE)
+}
+
 # Scraper configurations
+# rate_limit: per-host token bucket (requests/second after an initial burst)
+# page_workers: parallel page fetches for scrapers with a known page list
+#   (browser fetches are capped at DRIVER_POOL_CONFIG["size"])
 SCRAPER_CONFIG = {
     "cashify": {
-        "base_url": "https://www.cashify.in"
+        "base_url": "https://www.cashify.in",
+        "rate_limit": {"rate": 0.5, "burst": 2}
     },
     "refitGlobal":{
-        "base_url": "https://refitglobal.com/"
+        "base_url": "https://refitglobal.com/",
+        "rate_limit": {"rate": 1.0, "burst": 3}
     },
     "mobilegoo": {
-        "base_url": "https://mobilegoo.shop"
+        "base_url": "https://mobilegoo.shop",
+        "rate_limit": {"rate": 1.0, "burst": 3}
     },
     "flipkart": {
-        "base_url": "https://www.flipkart.com/search?q=refurbished+mobiles"
+        "base_url": "https://www.flipkart.com/search?q=refurbished+mobiles",
+        "rate_limit": {"rate": 0.3, "burst": 2},
+        "page_workers": 2
     },
     "quikr": {
-        "base_url": "https://www.quikr.com/mobiles-tablets/Mobile-Phones+India+y149f"
+        "base_url": "https://www.quikr.com/mobiles-tablets/Mobile-Phones+India+y149f",
+        "rate_limit": {"rate": 0.5, "burst": 2},
+        "scroll": {"max_scrolls": 15, "quiet_period": 3.0}
     },
     "maple": {
-        "base_url": "https://www.maplestore.in"
+        "base_url": "https://www.maplestore.in",
+        "rate_limit": {"rate": 1.0, "burst": 3},
+        "page_workers": 2
     }
 }
 
+# Concurrent scraper runs (app.run_all_scrapers)
+ORCHESTRATOR_CONFIG = {
+    "max_workers": 4,      # scrapers running at the same time
+    "timeout": 900,        # default deadline per scraper, in seconds
+    "timeouts": {          # per-scraper overrides
+        "Maple": 1200,
+    },
+    "run_timeout": 2400,       # whole refresh; scrapers not started by then are skipped
+    "page_timeout": 60,        # per page load (capped by the scraper's time left)
+    "failure_threshold": 3,    # failed runs in a row before a source's circuit opens
+    "breaker_cooldown": 6 * 3600,  # seconds an open circuit skips the source
+    "breaker_path": "breaker_state.json",
+}
 
+# Dashboard frame cache shared by all Streamlit sessions (database/cache.py)
+FRAME_CACHE_CONFIG = {
+    "check_interval": 30,   # seconds between data-version checks against the database
+    "max_entries": 32,      # cached results kept, least recently used dropped first
+    "max_mb": 512,          # cap on the memory held by cached frames
+}
+
+# Pooled HTTP sessions used by BaseScraper.get_page (non-Selenium requests)
+HTTP_CONFIG = {
+    "timeout": (5, 20),        # (connect, read) seconds
+    "pool_connections": 4,
+    "pool_maxsize": 8,
+    "retries": 3,
+    "backoff_factor": 0.5,
+}
+
+# Shared pool of warm headless Chrome browsers
+DRIVER_POOL_CONFIG = {
+    "size": 2,          # browsers kept alive at once
+    "max_uses": 20,     # leases before a browser is recycled
+}
+
+# Raw page archive used for offline re-parsing (python -m scraper.reparse)
+SNAPSHOT_CONFIG = {
+    "enabled": True,
+    "path": "snapshots",
+    "level": 10,        # zstd compression level
+}
+
+# HTML parser backend for parse_page: "html.parser", "lxml" or "selectolax"
+# (compare them with: python -m scraper.html_parser --source Quikr)
+PARSER_CONFIG = {
+    "backend": "lxml",
+    "partial": True,    # only build the tree for product containers (bs4 backends)
+}
+
+# Parsing runs in a process pool fed by the scraper threads
+PIPELINE_CONFIG = {
+    "enabled": True,
+    "parse_workers": 2,   # parser processes (None = one per core)
+    "max_pending": 8,     # pages queued or parsing before fetchers wait
+}
 
 # User authentication (simple demo)
 USERS = {
@@ -36,3 +118,15 @@ USERS = {
     "user": "user123"
 }
 AMAZON_API_KEY = ""
+
+# SerpApi searches for AmazonRenewed: every keyword x page is one paid call,
+# cached on disk for cache_ttl seconds and capped at monthly_quota calls
+SERPAPI_CONFIG = {
+    "keywords": ["renewed phone", "renewed smartphone", "refurbished mobile"],
+    "pages": 2,
+    "amazon_domain": "amazon.in",
+    "cache_dir": "serpapi_cache",
+    "cache_ttl": 6 * 3600,
+    "monthly_quota": 100,
+    "max_workers": 4,
+}
@@ -0,0 +1,195 @@
+"""Process-wide cache for dashboard frames, keyed on the database version.
+
+Streamlit reruns the whole script on every widget change, and every browser
+session runs it in the same process. Frames cached here are shared by all of
+them and reloaded only when device_data has changed: writes made by this
+process (scheduled scrapes, the sidebar buttons) invalidate immediately,
+and the database's version stamp is polled at most every check_interval
+seconds to catch writes from other processes (reparse, renormalize). Until
+then a rerun doesn't query the database at all.
+
+Cached frames (and other results) are shared; callers must not modify them
+in place. The least recently used entries are dropped once the cache holds
+more than max_entries results or max_mb of frames. A miss loads its result
+outside the cache lock, so one slow load only holds up sessions waiting for
+that same key.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from . import operations
+
+try:
+    from config import FRAME_CACHE_CONFIG
+except ImportError:
+    FRAME_CACHE_CONFIG = {}
+
+DEFAULT_CHECK_INTERVAL = 30  # seconds between version checks against the database
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_MB = 512
+
+
+class FrameCache:
+    def __init__(self, check_interval=DEFAULT_CHECK_INTERVAL, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_mb=DEFAULT_MAX_MB):
+        self.check_interval = check_interval
+        self.max_entries = max_entries
+        self.max_bytes = max_mb * 1e6
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._version = None
+        self._checked_at = None
+        self._seen_local_writes = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.version_checks = 0
+        self.last_load_seconds = None
+
+    def version(self):
+        """Current data version, asking the database only when it may have changed"""
+        local_writes = operations.local_write_count()
+        now = time.monotonic()
+        if (
+            self._version is None
+            or local_writes != self._seen_local_writes
+            or now - self._checked_at >= self.check_interval
+        ):
+            self._version = tuple(operations.data_version())
+            self._checked_at = now
+            self._seen_local_writes = local_writes
+            self.version_checks += 1
+        return self._version
+
+    def _cached(self, key, version):
+        """The entry's result if it is current (counting a hit), else None; call with _lock held"""
+        entry = self._entries.get(key)
+        if entry and entry["version"] == version:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+        return None
+
+    def _store(self, key, version, frame):
+        """Add a result and evict down to the limits; call with _lock held"""
+        # Entries from older versions can never hit again
+        for stale in [k for k, e in self._entries.items() if e["version"] != version or k == key]:
+            self._bytes -= self._entries.pop(stale)["bytes"]
+        size = _size_of(frame)
+        self._entries[key] = {"version": version, "frame": frame, "bytes": size}
+        self._bytes += size
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted["bytes"]
+            self.evictions += 1
+
+    def get(self, key, loader):
+        """Return the cached result of loader() for key, reloading if the data changed"""
+        with self._lock:
+            version = self.version()
+            entry = self._cached(key, version)
+            if entry:
+                return entry["frame"]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Only sessions after this same key wait for the load
+        with load_lock:
+            with self._lock:
+                entry = self._cached(key, version)
+                if entry:
+                    return entry["frame"]
+                self.misses += 1
+            try:
+                started = time.perf_counter()
+                frame = loader()
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.last_load_seconds = elapsed
+                    if version == self._version:
+                        self._store(key, version, frame)
+                return frame
+            finally:
+                with self._lock:
+                    self._load_locks.pop(key, None)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._version = None
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "evictions": self.evictions,
+                "memory_mb": self._bytes / 1e6,
+                "version": self._version,
+                "version_checks": self.version_checks,
+                "last_load_seconds": self.last_load_seconds,
+            }
+
+
+def _size_of(value):
+    if hasattr(value, "memory_usage"):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, tuple):
+        return sum(_size_of(item) for item in value)
+    return sys.getsizeof(value)
+
+
+frame_cache = FrameCache(
+    check_interval=FRAME_CACHE_CONFIG.get("check_interval", DEFAULT_CHECK_INTERVAL),
+    max_entries=FRAME_CACHE_CONFIG.get("max_entries", DEFAULT_MAX_ENTRIES),
+    max_mb=FRAME_CACHE_CONFIG.get("max_mb", DEFAULT_MAX_MB),
+)
+
+
+def _hashable(value):
+    if isinstance(value, (list, tuple, set)):
+        return tuple(sorted(value))
+    return value
+
+
+def cached_device_query(columns=None, **filters):
+    """query_devices(columns, **filters), shared until the data changes"""
+    key = (
+        "device_query",
+        tuple(columns or operations.FRAME_COLUMNS),
+        tuple(sorted((name, _hashable(value)) for name, value in filters.items())),
+    )
+    return frame_cache.get(key, lambda: operations.query_devices(columns, **filters))
+
+
+def cached_device_page(sort_by='date_scraped', descending=True, page=1, page_size=50, **filters):
+    """load_device_page(...), shared until the data changes"""
+    key = (
+        "device_page", sort_by, descending, page, page_size,
+        tuple(sorted((name, _hashable(value)) for name, value in filters.items())),
+    )
+    return frame_cache.get(
+        key, lambda: operations.load_device_page(sort_by, descending, page, page_size, **filters)
+    )
+
+
+def cached_device_count(**filters):
+    """count_devices(**filters), shared until the data changes"""
+    key = ("device_count", tuple(sorted((name, _hashable(value)) for name, value in filters.items())))
+    return frame_cache.get(key, lambda: operations.count_devices(**filters))
+
+
+def cached_brands():
+    return frame_cache.get(("brands",), operations.distinct_brands)
+
+
+def cached_date_bounds():
+    return frame_cache.get(("date_bounds",), operations.date_bounds)
@@ -0,0 +1,77 @@
+"""Show the query plans of the hot device_data queries and flag full table scans.
+
+    python -m database.explain
+    python -m database.explain --verbose   # print every plan, not just scans
+
+Exits non-zero if any query scans device_data without an index, so it can be
+run as a check after schema or query changes.
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import select, text
+from .models import DeviceData
+from .operations import (
+    get_db_manager, dedup_keys_query, latest_prices_query, filter_conditions, device_page_query,
+)
+
+
+def hot_queries():
+    """(name, statement) for the queries that run on every ingest or page load"""
+    now = datetime.utcnow()
+    return [
+        ("ingest dedup window", dedup_keys_query(["Cashify", "Maple"], now - timedelta(hours=24), now)),
+        ("latest prices", latest_prices_query(now - timedelta(days=1))),
+        ("dashboard filters", select(DeviceData).where(*filter_conditions(
+            brand="Apple", condition="Good", sources=["Cashify", "Maple"],
+            start_date=(now - timedelta(days=30)).date(), end_date=now.date(),
+        ))),
+        ("dashboard date range", select(DeviceData).where(*filter_conditions(
+            start_date=(now - timedelta(days=7)).date(), end_date=now.date(),
+        ))),
+        ("latest prices page", device_page_query(page=3, page_size=50)),
+        ("device price history", select(DeviceData.price, DeviceData.date_scraped).where(
+            DeviceData.brand == "Apple",
+            DeviceData.model == "iPhone 13",
+            DeviceData.date_scraped >= now - timedelta(days=30),
+        ).order_by(DeviceData.date_scraped)),
+    ]
+
+
+def explain(conn, statement):
+    """EXPLAIN QUERY PLAN rows (the detail column) for a statement"""
+    compiled = statement.compile(conn, compile_kwargs={"literal_binds": True})
+    return [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+
+
+def is_scan(detail):
+    """A plan step that reads device_data row by row instead of through an index"""
+    return detail.startswith("SCAN") and "device_data" in detail and "INDEX" not in detail
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the query plans of the hot device_data queries")
+    parser.add_argument("--verbose", action="store_true", help="print every plan step")
+    args = parser.parse_args()
+
+    engine = get_db_manager().engine
+    if engine.dialect.name != "sqlite":
+        sys.exit(f"EXPLAIN QUERY PLAN is SQLite-only (database is {engine.dialect.name})")
+
+    scans = 0
+    with engine.connect() as conn:
+        for name, statement in hot_queries():
+            plan = explain(conn, statement)
+            flagged = [detail for detail in plan if is_scan(detail)]
+            scans += bool(flagged)
+            print(f"{'⚠️' if flagged else '✅'} {name}")
+            for detail in (plan if args.verbose else flagged):
+                print(f"    {detail}")
+
+    if scans:
+        print(f"\n{scans} quer{'y' if scans == 1 else 'ies'} scan device_data; check the indexes in database/models.py")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Keep the indexes on device_data in line with the ones declared on DeviceData.
+
+create_all() builds indexes only when it creates a table, so databases from
+before an index was declared never get it. ensure_indexes() runs at startup:
+it creates declared indexes that are missing and drops managed indexes
+(the ix_device_data_ prefix) that are no longer declared, then refreshes the
+planner statistics if anything changed.
+"""
+from sqlalchemy import inspect, text
+from .models import DeviceData
+
+MANAGED_PREFIX = "ix_device_data_"
+
+
+def ensure_indexes(engine):
+    """Create missing and drop retired managed indexes; returns (created, dropped) names"""
+    table = DeviceData.__table__
+    declared = {index.name: index for index in table.indexes}
+    existing = {index["name"] for index in inspect(engine).get_indexes(table.name)}
+
+    created = [name for name in declared if name not in existing]
+    dropped = [name for name in existing if name.startswith(MANAGED_PREFIX) and name not in declared]
+
+    with engine.begin() as conn:
+        for name in created:
+            print(f"🗂️ Creating index {name}")
+            declared[name].create(conn, checkfirst=True)
+        for name in dropped:
+            print(f"🗂️ Dropping index {name}")
+            conn.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+        if (created or dropped) and engine.dialect.name in ("sqlite", "postgresql"):
+            conn.execute(text(f"ANALYZE {table.name}"))
+    return created, dropped
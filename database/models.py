@@ -1,7 +1,15 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime
+from sqlalchemy import create_engine, event, text, Column, Integer, String, Float, DateTime, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+import atexit
+import threading
+import time
+
+try:
+    from config import SQLITE_CONFIG
+except ImportError:
+    SQLITE_CONFIG = {}
 
 Base = declarative_base()
 
@@ -16,15 +24,117 @@ class DeviceData(Base):
     price = Column(Float, nullable=False)
     date_scraped = Column(DateTime, default=datetime.utcnow)
 
-    
+    # Managed by database.migrations.ensure_indexes; names must keep the ix_device_data_ prefix
+    __table_args__ = (
+        # Latest-prices cutoffs and the ingest dedup window
+        Index('ix_device_data_date_scraped', 'date_scraped'),
+        # Dedup keys and source/brand filters
+        Index('ix_device_data_source_brand_model_condition', 'source', 'brand', 'model', 'condition'),
+        # Per-device price history
+        Index('ix_device_data_brand_model_date', 'brand', 'model', 'date_scraped'),
+    )
+
     def __repr__(self):
         return f"<DevicePrice({self.source}, {self.brand} {self.model}, ₹{self.price})>"
 
+class DataVersion(Base):
+    """Single-row counter bumped by every write to device_data, so readers can
+    tell whether cached results are stale with one cheap query"""
+    __tablename__ = 'data_version'
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+SQLITE_DEFAULTS = {
+    "tuned": True,
+    "journal_mode": "WAL",        # readers and the writer don't block each other
+    "synchronous": "NORMAL",      # safe with WAL; fsync only at checkpoints
+    "cache_size_mb": 64,
+    "mmap_size_mb": 256,
+    "busy_timeout_ms": 5000,      # wait for a lock instead of failing with "database is locked"
+    "pool_size": 5,
+    "max_overflow": 10,
+    "checkpoint_interval": 300,   # seconds between WAL checkpoints after writes
+    "optimize_interval": 3600,    # seconds between PRAGMA optimize runs
+}
+
+
 class DBManager:
-    def __init__(self, db_url):
-        self.engine = create_engine(db_url)
+    def __init__(self, db_url, sqlite_config=None):
+        self.sqlite_config = {**SQLITE_DEFAULTS, **SQLITE_CONFIG, **(sqlite_config or {})}
+        self.tuned = (
+            db_url.startswith("sqlite") and ":memory:" not in db_url
+            and self.sqlite_config["tuned"]
+        )
+        self._maintenance_lock = threading.Lock()
+        self._last_checkpoint = self._last_optimize = time.monotonic()
+
+        if self.tuned:
+            self.engine = create_engine(
+                db_url,
+                pool_size=self.sqlite_config["pool_size"],
+                max_overflow=self.sqlite_config["max_overflow"],
+                pool_pre_ping=True,
+                connect_args={"check_same_thread": False},
+            )
+            event.listen(self.engine, "connect", self._apply_pragmas)
+            atexit.register(self.optimize)
+        else:
+            self.engine = create_engine(db_url)
         Base.metadata.create_all(self.engine)
+        # create_all only indexes new tables; bring existing databases up to date
+        from .migrations import ensure_indexes
+        ensure_indexes(self.engine)
         self.Session = sessionmaker(bind=self.engine)
         
     def get_session(self):
-        return self.Session()
\ No newline at end of file
+        return self.Session()
+
+    def _apply_pragmas(self, dbapi_connection, connection_record):
+        """Tune every new pooled SQLite connection"""
+        config = self.sqlite_config
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA journal_mode={config['journal_mode']}")
+            cursor.execute(f"PRAGMA synchronous={config['synchronous']}")
+            cursor.execute(f"PRAGMA cache_size=-{int(config['cache_size_mb'] * 1024)}")  # negative = KiB
+            cursor.execute(f"PRAGMA mmap_size={int(config['mmap_size_mb'] * 1024 * 1024)}")
+            cursor.execute(f"PRAGMA busy_timeout={int(config['busy_timeout_ms'])}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+        finally:
+            cursor.close()
+
+    def checkpoint(self):
+        """Copy the WAL back into the database file without waiting on readers"""
+        with self.engine.connect() as conn:
+            busy, wal_pages, moved = conn.execute(text("PRAGMA wal_checkpoint(PASSIVE)")).one()
+        return {"busy": bool(busy), "wal_pages": wal_pages, "checkpointed": moved}
+
+    def optimize(self):
+        """Let SQLite refresh the planner statistics (ANALYZE) where they are stale"""
+        if not self.tuned:
+            return
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("PRAGMA optimize"))
+        except Exception as e:
+            print(f"⚠️ PRAGMA optimize failed: {e}")
+
+    def after_write(self):
+        """Run the periodic checkpoint and optimize once their intervals have passed"""
+        if not self.tuned or not self._maintenance_lock.acquire(blocking=False):
+            return
+        try:
+            now = time.monotonic()
+            if now - self._last_checkpoint >= self.sqlite_config["checkpoint_interval"]:
+                self._last_checkpoint = now
+                result = self.checkpoint()
+                print(f"🧹 WAL checkpoint: {result['checkpointed']}/{result['wal_pages']} pages")
+            if now - self._last_optimize >= self.sqlite_config["optimize_interval"]:
+                self._last_optimize = now
+                self.optimize()
+        except Exception as e:
+            print(f"⚠️ Database maintenance failed: {e}")
+        finally:
+            self._maintenance_lock.release()
\ No newline at end of file
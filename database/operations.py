@@ -1,60 +1,148 @@
-from .models import DeviceData, DBManager
+from .models import DeviceData, DataVersion, DBManager
 from config import DATABASE_URL
+from collections import defaultdict
 from datetime import datetime, timedelta
+import itertools
+import time
 import pandas as pd
+from sqlalchemy import func, select
 
 db_manager = DBManager(DATABASE_URL)
 
-def add_device_prices(devices):
-    session = db_manager.get_session()
+# Writes made by this process; lets caches here invalidate without asking the database
+_local_writes = itertools.count(1)
+_local_write_count = 0
+
+DEDUP_WINDOW = timedelta(hours=24)
+INSERT_BATCH_SIZE = 1000
+KEY_COLUMNS = ('source', 'brand', 'model', 'condition', 'price')
+
+
+def _dedup_key(device):
+    return (device['source'], device['brand'], device['model'], device['condition'], float(device['price']))
+
+
+def bump_data_version(conn):
+    """Record a write to device_data; call inside the writing transaction"""
+    table = DataVersion.__table__
+    updated = conn.execute(table.update().where(table.c.id == 1).values(version=table.c.version + 1))
+    if updated.rowcount == 0:
+        conn.execute(table.insert().values(id=1, version=1))
+
+
+def note_local_write():
+    """Count a committed write from this process; call once its transaction has committed,
+    so a cache refilled in between can't pick up the old rows under the new count"""
+    global _local_write_count
+    _local_write_count = next(_local_writes)
+
+
+def data_version():
+    """Cheap stamp that changes whenever device_data does: (write counter, max id)"""
+    with db_manager.engine.connect() as conn:
+        return conn.execute(select(
+            select(DataVersion.version).where(DataVersion.id == 1).scalar_subquery(),
+            select(func.max(DeviceData.id)).scalar_subquery(),
+        )).one()
+
+
+def local_write_count():
+    """Number of writes this process has made to device_data"""
+    return _local_write_count
+
+
+def dedup_keys_query(sources, window_start, window_end):
+    """Dedup keys (and dates) of rows stored for these sources within the window"""
+    table = DeviceData.__table__
+    return select(*(table.c[name] for name in KEY_COLUMNS), table.c.date_scraped).where(
+        table.c.source.in_(sources),
+        table.c.date_scraped >= window_start,
+        table.c.date_scraped <= window_end,
+    )
+
+
+def latest_prices_query(cutoff_date):
+    return select(DeviceData).where(DeviceData.date_scraped >= cutoff_date)
+
+
+def ingest_device_prices(devices, batch_size=INSERT_BATCH_SIZE, lookahead=timedelta(0)):
+    """Insert devices, skipping any already stored in the 24 hours before they were scraped.
+
+    With lookahead, rows stored up to that long after a device's scrape time
+    count as duplicates too; re-parsed snapshots need it because the live row
+    from the same run was stored just after the fetch. The dedup keys for the whole window are read in one query and checked in
+    memory (devices repeated within the same call are skipped too), then the
+    new rows go in as executemany batches in a single transaction.
+    Returns a dict of inserted/skipped/failed counts.
+    """
+    started = time.perf_counter()
+    counts = {'inserted': 0, 'skipped': 0, 'failed': 0}
+    now = datetime.utcnow()
+
+    rows = []
+    for device in devices:
+        try:
+            # Re-parsed snapshots carry their original fetch time
+            rows.append((_dedup_key(device), device.get('date_scraped') or now))
+        except Exception as e:
+            counts['failed'] += 1
+            print(f"Error adding device: {device.get('model', 'Unknown')}")
+            print(f"Error details: {str(e)}")
+    if not rows:
+        return counts
+
+    table = DeviceData.__table__
+    window_start = min(scraped_at for _, scraped_at in rows) - DEDUP_WINDOW
+    window_end = max(scraped_at for _, scraped_at in rows) + lookahead
+    sources = {key[0] for key, _ in rows}
+
     try:
-        added_count = 0
-        for device in devices:
-            try:
-                # Check if device already exists in the last 24 hours
-                existing = session.query(DeviceData).filter(
-                    DeviceData.source == device['source'],
-                    DeviceData.brand == device['brand'],
-                    DeviceData.model == device['model'],
-                    DeviceData.condition == device['condition'],
-                    DeviceData.price == device['price'],
-                    DeviceData.date_scraped >= datetime.utcnow() - timedelta(hours=24)
-                ).first()
-                
-                if not existing:
-                    new_device = DeviceData(
-                        source=device['source'],
-                        brand=device['brand'],
-                        model=device['model'],
-                        condition=device['condition'],
-                        price=device['price']
-                    )
-                    session.add(new_device)
-                    added_count += 1
-            except Exception as e:
-                print(f"Error adding device: {device.get('model', 'Unknown')}")
-                print(f"Error details: {str(e)}")
-
-        session.commit()
-        print(f"Successfully added {added_count} devices to database")
-        return added_count
+        with db_manager.engine.begin() as conn:
+            # key -> dates it was stored at within the window
+            seen = defaultdict(list)
+            existing = conn.execute(dedup_keys_query(sources, window_start, window_end))
+            for *key, date_scraped in existing:
+                key[4] = float(key[4])
+                seen[tuple(key)].append(date_scraped)
+
+            new_rows = []
+            for key, scraped_at in rows:
+                cutoff = scraped_at - DEDUP_WINDOW
+                if any(cutoff <= stored <= scraped_at + lookahead for stored in seen[key]):
+                    counts['skipped'] += 1
+                    continue
+                seen[key].append(scraped_at)
+                new_rows.append(dict(zip(KEY_COLUMNS, key), date_scraped=scraped_at))
+
+            for i in range(0, len(new_rows), batch_size):
+                conn.execute(table.insert(), new_rows[i:i + batch_size])
+            if new_rows:
+                bump_data_version(conn)
+            counts['inserted'] = len(new_rows)
 
     except Exception as e:
-        session.rollback()
         print(f"Database commit failed: {str(e)}")
-        return 0
+        return {'inserted': 0, 'skipped': counts['skipped'], 'failed': counts['failed'] + len(rows) - counts['skipped']}
 
-    finally:
-        session.close()
+    if counts['inserted']:
+        note_local_write()
+    db_manager.after_write()
+    elapsed = time.perf_counter() - started
+    print(f"Successfully added {counts['inserted']} devices to database "
+          f"({counts['skipped']} duplicates skipped, {counts['failed']} failed, {elapsed * 1000:.0f} ms)")
+    return counts
+
+
+def add_device_prices(devices):
+    """Insert new devices and return how many were added"""
+    return ingest_device_prices(devices)['inserted']
 
 
 def get_latest_prices(days=1):
     session = db_manager.get_session()
     try:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        results = session.query(DeviceData).filter(
-            DeviceData.date_scraped >= cutoff_date
-        ).all()
+        results = session.scalars(latest_prices_query(cutoff_date)).all()
         return results
     finally:
         session.close()
@@ -68,6 +156,116 @@ def get_all_data():
         session.close()
 
 
+FRAME_COLUMNS = ['id', 'source', 'brand', 'model', 'condition', 'price', 'date_scraped']
+FRAME_DTYPES = {'id': 'int64', 'price': 'float64'}
+def load_device_frame(columns=None, where=None):
+    """Read device_data straight into a DataFrame, selecting only the given columns.
+
+    One read_sql call fills typed columns (int64 ids, float64 prices,
+    datetime64 dates) without building ORM objects or per-row dicts. The whole
+    result is held in memory, so narrow it with columns and where.
+    where is an optional list of SQLAlchemy conditions on DeviceData.
+    """
+    columns = list(columns or FRAME_COLUMNS)
+    table = DeviceData.__table__
+    statement = select(*(table.c[name] for name in columns))
+    if where:
+        statement = statement.where(*where)
+
+    dtypes = {name: dtype for name, dtype in FRAME_DTYPES.items() if name in columns}
+    parse_dates = ['date_scraped'] if 'date_scraped' in columns else None
+    with db_manager.engine.connect() as conn:
+        df = pd.read_sql(statement, conn, dtype=dtypes, parse_dates=parse_dates)
+
+    if df.empty:
+        return empty_frame(columns)
+    return df
+
+
+def filter_conditions(brand=None, condition=None, sources=None, start_date=None, end_date=None):
+    """SQL conditions for the dashboard filters ("All" or empty means no filter).
+
+    start_date and end_date are inclusive calendar dates. Sources and brand
+    are served by the (source, brand, ...) index, the date range by the
+    date_scraped index.
+    """
+    conditions = []
+    if sources:
+        conditions.append(DeviceData.source.in_(list(sources)))
+    if brand and brand != "All":
+        conditions.append(DeviceData.brand == brand)
+    if condition and condition != "All":
+        conditions.append(DeviceData.condition == condition)
+    if start_date:
+        conditions.append(DeviceData.date_scraped >= datetime.combine(start_date, datetime.min.time()))
+    if end_date:
+        conditions.append(DeviceData.date_scraped < datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+    return conditions
+
+
+def query_devices(columns=None, **filters):
+    """Rows matching the dashboard filters (see filter_conditions), only the given columns"""
+    return load_device_frame(columns, where=filter_conditions(**filters))
+
+
+def count_devices(**filters):
+    """Number of rows matching the dashboard filters"""
+    with db_manager.engine.connect() as conn:
+        return conn.execute(
+            select(func.count()).select_from(DeviceData).where(*filter_conditions(**filters))
+        ).scalar_one()
+
+
+def device_page_query(sort_by='date_scraped', descending=True, page=1, page_size=50, columns=None, **filters):
+    """One page of filtered rows ordered by any column, with id as the tie-breaker.
+
+    The default (newest first) walks the date_scraped index backwards and
+    stops after the page; other sort columns sort only the filtered rows.
+    """
+    if sort_by not in FRAME_COLUMNS:
+        raise ValueError(f"Cannot sort by {sort_by!r}")
+    table = DeviceData.__table__
+    order = [table.c[sort_by], table.c.id]
+    if descending:
+        order = [column.desc() for column in order]
+    return (
+        select(*(table.c[name] for name in (columns or FRAME_COLUMNS)))
+        .where(*filter_conditions(**filters))
+        .order_by(*order)
+        .limit(page_size)
+        .offset((max(page, 1) - 1) * page_size)
+    )
+
+
+def load_device_page(sort_by='date_scraped', descending=True, page=1, page_size=50, columns=None, **filters):
+    """One page of a server-side paginated table (count_devices gives the total)"""
+    statement = device_page_query(sort_by, descending, page, page_size, columns, **filters)
+    columns = list(columns or FRAME_COLUMNS)
+    dtypes = {name: dtype for name, dtype in FRAME_DTYPES.items() if name in columns}
+    parse_dates = ['date_scraped'] if 'date_scraped' in columns else None
+    with db_manager.engine.connect() as conn:
+        return pd.read_sql(statement, conn, dtype=dtypes, parse_dates=parse_dates)
+
+
+def distinct_brands():
+    with db_manager.engine.connect() as conn:
+        return conn.scalars(select(DeviceData.brand).distinct().order_by(DeviceData.brand)).all()
+
+
+def date_bounds():
+    """(earliest, latest) date_scraped, or (None, None) for an empty table"""
+    with db_manager.engine.connect() as conn:
+        return tuple(conn.execute(select(func.min(DeviceData.date_scraped), func.max(DeviceData.date_scraped))).one())
+
+
+def empty_frame(columns=None):
+    columns = list(columns or FRAME_COLUMNS)
+    frame = pd.DataFrame({name: pd.Series(dtype=FRAME_DTYPES.get(name, object)) for name in columns})
+    if 'date_scraped' in columns:
+        frame['date_scraped'] = pd.Series(dtype='datetime64[ns]')
+    return frame
+
+
 def to_dataframe(query_result):
     if not query_result:
         return pd.DataFrame(columns=[
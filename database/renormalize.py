@@ -0,0 +1,163 @@
+"""Re-apply the current brand and condition rules to rows already in device_data.
+
+    python -m database.renormalize --dry-run --report changes.csv
+    python -m database.renormalize
+    python -m database.renormalize --check
+
+Only rules that give the same answer when run on their own output are
+re-applied. extract_model is written for raw titles and is not one of them
+("Redmi Note 10 Pro" would lose "Redmi" again), and the raw titles are not
+stored, so models are left as scraped.
+"""
+import sys
+import argparse
+import time
+import pandas as pd
+from sqlalchemy import bindparam, text
+from .models import DeviceData
+from .operations import get_db_manager, bump_data_version, note_local_write
+from utils.normalization import (
+    normalize_brand, normalize_condition, extract_model, normalize_brand_series, normalize_condition_series,
+)
+
+COLUMNS = ['brand', 'condition']
+
+# Raw listing titles and conditions as scrapers see them, for check_noop
+SAMPLE_LISTINGS = [
+    ("Xiaomi Redmi Note 10 Pro", "Good"),
+    ("Poco X3 Pro", "Fair"),
+    ("(Refurbished) Apple iPhone 13 (128 GB) - Blue", "Renewed"),
+    ("Samsung Galaxy S21 FE 5G", "Excellent"),
+    ("OnePlus Nord CE 3 Lite", "Like New"),
+    ("Redmi 9A Sport", None),
+    ("iQOO Z7 Pro", "very good"),
+    ("HONOR X9b", "Refurbished - Superb"),
+    ("OPPO Reno8 T", "damaged screen"),
+    ("Nothing Phone (2a)", "Open box"),
+]
+
+
+def _apply_to_distinct(values, normalize):
+    """Run a vectorized rule over the distinct values only, then broadcast back"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    normalized = normalize(pd.Series(uniques, dtype=object)).to_numpy()
+    return pd.Series(normalized[codes], index=values.index)
+
+
+def renormalize_chunk(chunk):
+    """Return the rows of a chunk whose normalized values differ, with old and new values"""
+    normalized = pd.DataFrame({
+        'id': chunk['id'],
+        'brand': _apply_to_distinct(chunk['brand'], normalize_brand_series),
+        'condition': _apply_to_distinct(chunk['condition'], normalize_condition_series),
+    })
+    changed = (normalized[COLUMNS] != chunk[COLUMNS]).any(axis=1)
+    return chunk[changed].merge(normalized[changed], on='id', suffixes=('_old', ''))
+
+
+def check_noop(listings=SAMPLE_LISTINGS):
+    """Ingest-normalize sample listings the way scrapers do, run the job's rules
+    over the result and return the rows it would change (empty when the rules
+    are idempotent on stored values)"""
+    fresh = pd.DataFrame([{
+        'id': i,
+        'brand': normalize_brand(title),
+        'model': extract_model(title),
+        'condition': normalize_condition(condition),
+    } for i, (title, condition) in enumerate(listings, start=1)])
+    return renormalize_chunk(fresh[['id'] + COLUMNS])
+
+
+def renormalize(chunksize=50000, dry_run=False):
+    """Stream device_data by id in chunks and rewrite rows whose values changed.
+
+    Each chunk is read, normalized column-wise and written back in one
+    executemany UPDATE before the next is read. Returns all changed rows.
+    """
+    engine = get_db_manager().engine
+    table = DeviceData.__table__
+    update_stmt = (
+        table.update()
+        .where(table.c.id == bindparam('row_id'))
+        .values(brand=bindparam('brand'), condition=bindparam('condition'))
+    )
+    select_chunk = text(
+        "SELECT id, brand, condition FROM device_data WHERE id > :last_id ORDER BY id LIMIT :limit"
+    )
+
+    if not dry_run:
+        rewritten = check_noop()
+        if not rewritten.empty:
+            raise RuntimeError(f"Rules would rewrite freshly ingested values:\n{rewritten}")
+
+    started = time.perf_counter()
+    last_id = 0
+    scanned = 0
+    changes = []
+    while True:
+        with engine.connect() as conn:
+            chunk = pd.read_sql(select_chunk, conn, params={'last_id': last_id, 'limit': chunksize})
+        if chunk.empty:
+            break
+        scanned += len(chunk)
+        last_id = int(chunk['id'].iloc[-1])
+
+        changed = renormalize_chunk(chunk)
+        if not changed.empty:
+            changes.append(changed)
+            if not dry_run:
+                rows = changed.rename(columns={'id': 'row_id'})[['row_id'] + COLUMNS].to_dict('records')
+                with engine.begin() as conn:
+                    conn.execute(update_stmt, rows)
+                    bump_data_version(conn)
+                note_local_write()
+
+    if not dry_run:
+        get_db_manager().after_write()
+
+    changes = pd.concat(changes, ignore_index=True) if changes else pd.DataFrame(
+        columns=['id'] + [f'{c}_old' for c in COLUMNS] + COLUMNS
+    )
+    action = "would change" if dry_run else "updated"
+    print(f"🔁 Scanned {scanned} rows, {action} {len(changes)} in {time.perf_counter() - started:.2f}s")
+    return changes
+
+
+def diff_report(changes, top=10):
+    """Print the most common old -> new transitions per column"""
+    for column in COLUMNS:
+        moved = changes[changes[f'{column}_old'] != changes[column]]
+        if moved.empty:
+            continue
+        print(f"\n{column}: {len(moved)} rows")
+        transitions = moved.groupby([f'{column}_old', column]).size().sort_values(ascending=False)
+        for (old, new), count in transitions.head(top).items():
+            print(f"  {old!r} -> {new!r}  ({count})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-normalize stored brand/model/condition values")
+    parser.add_argument("--dry-run", action="store_true", help="report changes without writing them")
+    parser.add_argument("--chunksize", type=int, default=50000)
+    parser.add_argument("--report", help="write every changed row (old and new values) to this CSV")
+    parser.add_argument("--check", action="store_true",
+                        help="only check that the rules leave freshly ingested values unchanged")
+    args = parser.parse_args()
+
+    if args.check:
+        rewritten = check_noop()
+        if rewritten.empty:
+            print(f"✅ No changes to {len(SAMPLE_LISTINGS)} freshly ingested sample rows")
+            return
+        print(f"❌ The rules rewrite freshly ingested values:\n{rewritten.to_string(index=False)}")
+        sys.exit(1)
+
+    changes = renormalize(chunksize=args.chunksize, dry_run=args.dry_run)
+    diff_report(changes)
+    if args.report:
+        changes.to_csv(args.report, index=False)
+        print(f"💾 Wrote {len(changes)} changed rows to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
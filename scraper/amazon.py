@@ -1,37 +1,69 @@
 import re
-import requests
+import json
 from .base_scraper import BaseScraper
 from utils.normalization import normalize_brand, normalize_condition, extract_model
+from .serpapi import SerpApiClient, SERPAPI_ENDPOINT
+from .snapshots import archive_page
 from config import AMAZON_API_KEY
 
+try:
+    from config import SERPAPI_CONFIG
+except ImportError:
+    SERPAPI_CONFIG = {}
+
 class AmazonRenewedScraper(BaseScraper):
-    def __init__(self):
+    def __init__(self, client=None):
         super().__init__("AmazonRenewed")
-        self.api_endpoint = "https://serpapi.com/search.json"
+        self.config = SERPAPI_CONFIG
+        self.api_endpoint = SERPAPI_ENDPOINT
         self.params = {
             "engine": "amazon",
-            "k": "renewed phone",          # keyword
-            "amazon_domain": "amazon.in",  # India marketplace
-            "api_key": AMAZON_API_KEY,
+            "amazon_domain": self.config.get("amazon_domain", "amazon.in"),  # India marketplace
         }
+        self.client = client or SerpApiClient(
+            AMAZON_API_KEY,
+            cache_dir=self.config.get("cache_dir", "serpapi_cache"),
+            ttl=self.config.get("cache_ttl", 6 * 3600),
+            monthly_quota=self.config.get("monthly_quota", 100),
+            max_workers=self.config.get("max_workers", 4),
+        )
 
-    def scrape(self):
-        try:
-            print(f"🔍 Fetching from SerpApi: {self.api_endpoint}")
-            response = requests.get(self.api_endpoint, params=self.params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            if "organic_results" not in data:
-                print("⚠️ No 'organic_results' found in response")
-                return []
+    def search_params(self):
+        """One request per keyword and result page"""
+        keywords = self.config.get("keywords", ["renewed phone"])
+        pages = self.config.get("pages", 1)
+        return [
+            {**self.params, "k": keyword, "page": page}
+            for keyword in keywords
+            for page in range(1, pages + 1)
+        ]
 
-            return self.parse_api_response(data["organic_results"])
+    def scrape_iter(self):
+        try:
+            param_sets = self.search_params()
+            print(f"🔍 Fetching {len(param_sets)} SerpApi searches from {self.api_endpoint}")
+            for params, data, from_cache in self.client.search_many(param_sets):
+                if not from_cache:
+                    query = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+                    archive_page(self.source_name, f"{self.api_endpoint}?{query}", json.dumps(data))
+                print(f"{'💾 Cached' if from_cache else '🌐 Live'} results for {params['k']!r} page {params['page']}")
+                yield self.parse_response(data)
 
         except Exception as e:
             print(f"❌ SerpApi error: {e}")
+            raise
+
+    def parse_page(self, content):
+        """Parse a raw SerpApi JSON response (live or archived)"""
+        return self.parse_response(json.loads(content))
+
+    def parse_response(self, data):
+        if "organic_results" not in data:
+            print("⚠️ No 'organic_results' found in response")
             return []
 
+        return self.parse_api_response(data["organic_results"])
+
     def parse_api_response(self, items):
         print(f"📦 Found {len(items)} items from Amazon Renewed via SerpApi")
 
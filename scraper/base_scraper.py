@@ -1,97 +1,301 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
-import requests
+import copy
+import threading
+from collections import deque
 import time
-import random
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from pathlib import Path
+from . import http_session
+from .driver_pool import get_driver_pool
+from .rate_limiter import rate_limiter
+from .snapshots import archive_page
+from .html_parser import make_soup
+from . import pipeline
+from . import page_state
+from . import supervisor
+
+DEFAULT_PAGE_WORKERS = 2  # matches the default driver pool size
+
 
 class BaseScraper:
+    # SoupStrainer restricting parsing to the product containers (None = whole page)
+    parse_only = None
+
     def __init__(self, source_name):
         self.source_name = source_name
         self.driver = None
-        
+        self.driver_broken = False
+        # Set when built under supervisor.deadline(); copies made for page workers share it
+        self.deadline = supervisor.current_deadline()
+
+    def time_left(self, cap=None):
+        """Seconds left before this scraper's deadline, at most cap (raises DeadlineExceeded)"""
+        return supervisor.time_left(self.deadline, cap)
+
+    def scrape_iter(self):
+        """Yield device batches (usually one per page) as they are parsed.
+
+        Scrapers implement either this or scrape(); batches already yielded are
+        kept even if a later page fails.
+        """
+        yield self.scrape()
+
+    def scrape(self):
+        """Scrape everything into one list"""
+        return [device for batch in self.scrape_iter() for device in batch]
+
+    def make_soup(self, html):
+        """Parse a page with the configured backend, limited to parse_only"""
+        return make_soup(html, parse_only=self.parse_only)
+
+    def parse_async(self, html):
+        """Parse a page in the shared parser process pool; returns a Future of parse_page's result"""
+        return pipeline.parse_async(self, html)
+
+    def parse_pipelined(self, pages):
+        """Parse pages from an iterator of fetched HTML, yielding results in page order.
+
+        Each page is handed to the parser pool as soon as it is fetched and
+        the iterator moves on to fetch the next one, so fetching and parsing
+        overlap; the pool's max_pending bound makes fetching wait when parsers
+        fall behind. Finished results are yielded as fetching goes on.
+        """
+        pending = deque()
+        for html in pages:
+            if html is None:
+                continue
+            pending.append(self.parse_async(html))
+            while pending and pending[0].done():
+                yield pending.popleft().result()
+        while pending:
+            yield self.wait_for(pending.popleft())
+
+    def wait_for(self, future):
+        """Result of a parse (or page) future, waiting no longer than the deadline allows"""
+        with supervisor.waiting_for("a page"):
+            return future.result(timeout=self.time_left())
+
     def setup_selenium(self):
-        """Setup headless Chrome browser"""
-        options = Options()
-        options.add_argument("--headless=new")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--no-sandbox")
-        options.add_argument('--enable-unsafe-webgl')
-        options.add_argument('--use-gl=swiftshader')
-        options.add_argument('--enable-unsafe-swiftshader')
-        options.add_argument('--ignore-gpu-blocklist')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        
-        
-
-        driver_path = ChromeDriverManager().install()
-        if not driver_path.endswith("chromedriver.exe"):
-            candidate = Path(driver_path).parent / "chromedriver.exe"
-            if candidate.exists():
-                driver_path = str(candidate)
-            else:
-                raise FileNotFoundError(f"Could not find chromedriver.exe in {Path(driver_path).parent}")
-        service = Service(driver_path)
-        self.driver = webdriver.Chrome(service=service, options=options)
-        self.driver.implicitly_wait(10)
-            
+        """Lease a warm headless Chrome from the shared driver pool"""
+        with supervisor.waiting_for("a browser"):
+            self.driver = get_driver_pool().acquire(timeout=self.time_left())
+        self.driver_broken = False
+
     def close_selenium(self):
-        """Close browser if open"""
+        """Return the browser to the pool if one is leased"""
         if self.driver:
-            self.driver.quit()
-            
-    def get_page(self, url, use_selenium=False):
-        time.sleep(random.uniform(1, 3))
+            get_driver_pool().release(self.driver, broken=self.driver_broken)
+            self.driver = None
+
+    def get_page(self, url, use_selenium=False, params=None, conditional=False, archive=True):
+        """Fetch a page's HTML and archive a snapshot of it.
+
+        With conditional=True (HTTP only) the server is asked whether the page
+        changed since the last fetch; if it didn't, the copy from that fetch is
+        returned, so an unchanged page still yields a dated observation.
+        """
+        html = self._fetch(url, use_selenium, params, conditional)
+        if archive and html is not None:
+            # Keep credentials such as the SerpApi key out of the archive index
+            public_params = {k: v for k, v in (params or {}).items() if k != "api_key"}
+            archive_url = f"{url}?{urlencode(public_params)}" if public_params else url
+            archive_page(self.source_name, archive_url, html)
+        return html
+
+    def state_is_usable(self, products):
+        """Whether products read from a page's embedded state can stand in for the rendered page"""
+        return bool(products)
+
+    def get_page_with_state(self, url):
+        """Fetch a page over plain HTTP when its embedded page state lists usable products,
+        rendering it in the browser only when it doesn't"""
+        try:
+            html = self.get_page(url, use_selenium=False, archive=False)
+            if self.state_is_usable(page_state.extract_products(html)):
+                archive_page(self.source_name, url, html)
+                return html
+            print(f"No embedded page state, rendering in browser: {url}")
+        except supervisor.DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"Plain HTTP fetch failed ({e}), rendering in browser: {url}")
+        return self.get_page(url, use_selenium=True)
+
+    def _fetch(self, url, use_selenium, params, conditional):
+        with supervisor.waiting_for("the rate limit"):
+            rate_limiter.acquire(url, timeout=self.time_left())
+        page_budget = self.time_left(supervisor.page_timeout())
 
         if use_selenium:
             if not self.driver:
                 self.setup_selenium()
 
-            self.driver.get(url)
+            try:
+                self.driver.set_page_load_timeout(page_budget)
+                self.driver.get(url)
 
-            # Flipkart-specific logic
-            if "flipkart.com" in url:
-                try:
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CLASS_NAME, "cPHDOP"))
-                    )
-                except Exception as e:
-                    print(f"Flipkart wait error: {e}")
+                # Wait budgets are taken before each try so a passed deadline isn't swallowed
+                # Flipkart-specific logic
+                if "flipkart.com" in url:
+                    wait = self.time_left(10)
+                    try:
+                        WebDriverWait(self.driver, wait).until(
+                            EC.presence_of_element_located((By.CLASS_NAME, "cPHDOP"))
+                        )
+                    except Exception as e:
+                        print(f"Flipkart wait error: {e}")
 
-            # Maple-specific logic
-            elif "maple" in url:
+                # Maple-specific logic
+                elif "maple" in url:
+                    wait = self.time_left(10)
+                    try:
+                        WebDriverWait(self.driver, wait).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, "li.card"))
+                        )
+                    except Exception as e:
+                        print(f"Maple wait error: {e}")
+
+                # Scroll down slightly in all selenium requests
+                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                wait = self.time_left(2)
                 try:
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "li.card"))
+                    WebDriverWait(self.driver, wait).until(
+                        lambda d: d.execute_script("return document.readyState") == "complete"
                     )
                 except Exception as e:
-                    print(f"Maple wait error: {e}")
-
-            # Scroll down slightly in all selenium requests
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+                    print(f"Page settle wait error: {e}")
 
-            return self.driver.page_source
+                return self.driver.page_source
+            except TimeoutException:
+                print(f"⏱️ Page load timed out after {page_budget:.0f}s: {url}")
+                raise
+            except WebDriverException:
+                # Don't hand a crashed browser back to the pool
+                self.driver_broken = True
+                raise
 
         else:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
                 'Accept-Language': 'en-US,en;q=0.9',
             }
-            response = requests.get(url, headers=headers)
+            timeout = http_session.capped_timeout(page_budget)
+            response = http_session.fetch(
+                url, params=params, headers=headers, conditional=conditional, timeout=timeout,
+            )
+            rate_limiter.report(url, response.status_code, response.headers.get("Retry-After"))
+            if response.status_code == 304:
+                body = http_session.cached_body(url, params)
+                if body is not None:
+                    print(f"♻️ Not modified since last fetch, re-using it: {url}")
+                    return body
+                # A 304 we didn't ask for; fetch the page in full
+                response = http_session.fetch(url, params=params, headers=headers, timeout=timeout)
             response.raise_for_status()
             return response.text
 
 
-        
+    def scroll_until_stable(self, item_selector=None, quiet_period=3.0, max_scrolls=15, poll_interval=0.25):
+        """Scroll an infinite-scroll page until it stops growing.
+
+        Growth is measured by the number of elements matching item_selector, or
+        by document height when no selector is given. Returns the page source
+        and how many items (or pixels) each scroll added.
+        """
+        if item_selector:
+            measure_script = "return document.querySelectorAll(arguments[0]).length;"
+        else:
+            measure_script = "return document.body.scrollHeight;"
+
+        def measure():
+            return self.driver.execute_script(measure_script, item_selector)
+
+        added_per_scroll = []
+        last = measure()
+        for i in range(max_scrolls):
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                print(f"⏱️ Deadline reached, keeping the page after {i} scrolls")
+                break
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+
+            # Wait up to quiet_period for growth, then let the batch finish arriving
+            current = last
+            settle_by = time.monotonic() + quiet_period
+            while time.monotonic() < settle_by:
+                time.sleep(poll_interval)
+                previous, current = current, measure()
+                if current > last and current == previous:
+                    break
+
+            if current <= last:
+                print(f"⏹️ Page stopped growing after {i} scrolls")
+                break
+
+            added_per_scroll.append(current - last)
+            print(f"⬇️ Scroll {i + 1}/{max_scrolls}: +{current - last}")
+            last = current
+
+        return self.driver.page_source, added_per_scroll
+
+    def fetch_pages(self, urls, use_selenium=False, workers=None, embedded_state=False):
+        """Fetch and parse a known list of page urls in parallel.
+
+        Each page gets its own browser lease (or pooled HTTP request) and still
+        goes through the per-host rate limit. Yields the parsed device lists in
+        page order, stopping at the first page that yields no devices; pages
+        after it that are still pending are cancelled. With embedded_state=True
+        pages go through get_page_with_state instead.
+        """
+        if workers is None:
+            workers = getattr(self, "config", {}).get("page_workers", DEFAULT_PAGE_WORKERS)
+        if use_selenium:
+            # More workers than browsers would only queue on the pool
+            workers = min(workers, get_driver_pool().size)
+
+        stop_at = [len(urls)]
+        lock = threading.Lock()
+
+        def fetch(index, url):
+            with lock:
+                if index > stop_at[0]:
+                    return []
+
+            worker = copy.copy(self)
+            worker.driver = None
+            worker.driver_broken = False
+            try:
+                print(f"Fetching page: {url}")
+                if embedded_state:
+                    html = worker.get_page_with_state(url)
+                else:
+                    html = worker.get_page(url, use_selenium=use_selenium)
+            finally:
+                worker.cleanup()
+
+            devices = self.wait_for(self.parse_async(html)) if html is not None else []
+            if not devices:
+                with lock:
+                    stop_at[0] = min(stop_at[0], index)
+            return devices
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = [executor.submit(fetch, i, url) for i, url in enumerate(urls)]
+            try:
+                for index, future in enumerate(futures):
+                    devices = self.wait_for(future)
+                    if not devices:
+                        print(f"No devices found at {urls[index]}. Stopping early.")
+                        break
+                    yield devices
+            finally:
+                with lock:
+                    stop_at[0] = -1
+                for future in futures:
+                    future.cancel()
+
     def cleanup(self):
         """Ensure browser is closed after scraping"""
         self.close_selenium()
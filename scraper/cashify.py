@@ -1,16 +1,19 @@
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from . import page_state
 import re
 from utils.normalization import normalize_brand, normalize_condition, extract_model
 
 
 class CashifyScraper(BaseScraper):
+    parse_only = SoupStrainer('a', href=re.compile(r'^/buy-refurbished-'))
+
     def __init__(self):
         super().__init__("Cashify")
         from config import SCRAPER_CONFIG
         self.config = SCRAPER_CONFIG["cashify"]
         
-    def scrape(self):
+    def scrape_iter(self):
         try:
             categories = [
                 (f"{self.config['base_url']}/buy-refurbished-mobile-phones", "Phone"),
@@ -19,24 +22,43 @@ class CashifyScraper(BaseScraper):
                 (f"{self.config['base_url']}/buy-refurbished-smart-watches", "Smartwatch"),
             ]
 
-            all_devices = []
-
-            for url, category in categories:
-                print(f"Scraping category: {category} | URL: {url}")
-                html_content = self.get_page(url, use_selenium=True)
-                category_devices = self.parse_page(html_content)
-                all_devices.extend(category_devices)
+            def pages():
+                for url, category in categories:
+                    print(f"Scraping category: {category} | URL: {url}")
+                    yield self.get_page_with_state(url)
 
-            return all_devices
+            # Categories are parsed in the background while the next one loads
+            yield from self.parse_pipelined(pages())
 
         except Exception as e:
             print(f"Cashify scraper error: {str(e)}")
-            return []
+            raise
         finally:
             self.cleanup()
 
+    def parse_state_products(self, products):
+        devices = []
+        for product in products:
+            try:
+                device_name = product['name']
+                devices.append({
+                    'source': self.source_name,
+                    'brand': normalize_brand(device_name.split()[0]),
+                    'model': extract_model(device_name),
+                    'condition': normalize_condition(product['condition'] or "Good"),
+                    'price': product['price']
+                })
+            except Exception as e:
+                print(f"Error processing device: {str(e)}")
+        print(f"Returning {len(devices)} devices from page state")
+        return devices
+
     def parse_page(self, html_content):
-        soup = BeautifulSoup(html_content, 'html.parser')
+        products = page_state.extract_products(html_content)
+        if products:
+            return self.parse_state_products(products)
+
+        soup = self.make_soup(html_content)
         devices = []
 
         device_containers = soup.select('a[href^="/buy-refurbished-"]')
@@ -0,0 +1,156 @@
+import atexit
+import queue
+import threading
+from pathlib import Path
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+try:
+    from config import DRIVER_POOL_CONFIG
+except ImportError:
+    DRIVER_POOL_CONFIG = {}
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def chrome_options():
+    """Options for the headless Chrome used by every scraper"""
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--no-sandbox")
+    options.add_argument('--enable-unsafe-webgl')
+    options.add_argument('--use-gl=swiftshader')
+    options.add_argument('--enable-unsafe-swiftshader')
+    options.add_argument('--ignore-gpu-blocklist')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    return options
+
+
+def resolve_driver_path():
+    """Install/locate chromedriver once per process"""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            driver_path = ChromeDriverManager().install()
+            if not driver_path.endswith("chromedriver.exe"):
+                candidate = Path(driver_path).parent / "chromedriver.exe"
+                if candidate.exists():
+                    driver_path = str(candidate)
+                else:
+                    raise FileNotFoundError(f"Could not find chromedriver.exe in {Path(driver_path).parent}")
+            _driver_path = driver_path
+        return _driver_path
+
+
+class DriverPool:
+    """Keeps up to `size` warm headless browsers and leases them to scrapers.
+
+    A browser is reset (cookies cleared, blank page) when it comes back and
+    is recycled after `max_uses` leases or as soon as it is reported broken.
+    """
+
+    def __init__(self, size=2, max_uses=20):
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = queue.LifoQueue()
+        self._uses = {}
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    def _start(self):
+        service = Service(resolve_driver_path())
+        driver = webdriver.Chrome(service=service, options=chrome_options())
+        driver.implicitly_wait(10)
+        with self._lock:
+            self._uses[driver] = 0
+        return driver
+
+    def _quit(self, driver):
+        with self._lock:
+            self._uses.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+
+    def _is_alive(self, driver):
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _reset(self, driver):
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            pass  # about:blank and some origins don't expose storage
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def acquire(self, timeout=None):
+        """Lease a browser, starting one if none is idle"""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser available within {timeout}s")
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._start()
+                if self._is_alive(driver):
+                    return driver
+                self._quit(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, broken=False):
+        """Return a leased browser to the pool"""
+        try:
+            with self._lock:
+                uses = self._uses.get(driver, 0) + 1
+                self._uses[driver] = uses
+
+            if broken or uses >= self.max_uses:
+                self._quit(driver)
+                return
+
+            try:
+                self._reset(driver)
+                self._idle.put(driver)
+            except WebDriverException:
+                self._quit(driver)
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Shared pool used by all scrapers in this process"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool(
+                size=DRIVER_POOL_CONFIG.get("size", 2),
+                max_uses=DRIVER_POOL_CONFIG.get("max_uses", 20),
+            )
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -1,6 +1,6 @@
 import re
-import time
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from .html_parser import class_pattern
 from .base_scraper import BaseScraper
 from utils.normalization import normalize_brand, normalize_condition, extract_model
 from selenium import webdriver
@@ -14,41 +14,29 @@ from selenium.webdriver.support import expected_conditions as EC
 
 
 class FlipkartScraper(BaseScraper):
+    parse_only = SoupStrainer('div', class_=class_pattern('cPHDOP'))
+
     def __init__(self):
         super().__init__("Flipkart")
         from config import SCRAPER_CONFIG
         self.config = SCRAPER_CONFIG["flipkart"]
 
-    def scrape(self):
+    def scrape_iter(self):
         try:
-            all_devices = []
             base_url = self.config['base_url']
 
             max_pages = 5
-            for page_num in range(1, max_pages + 1):
-                current_url = f"{base_url}&page={page_num}"
-                print(f"📄 Fetching page {page_num}: {current_url}")
-
-                html = self.get_page(current_url, use_selenium=True)
-                devices = self.parse_page(html)
-
-                if not devices:
-                    print("🛑 No devices found on this page. Stopping pagination.")
-                    break
-
-                all_devices.extend(devices)
-                time.sleep(1.5)
-
-            return all_devices
+            page_urls = [f"{base_url}&page={page_num}" for page_num in range(1, max_pages + 1)]
+            yield from self.fetch_pages(page_urls, use_selenium=True)
 
         except Exception as e:
             print(f"Flipkart scraper error: {str(e)}")
-            return []
+            raise
         finally:
             self.cleanup()
 
     def parse_page(self, html_content):
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = self.make_soup(html_content)
         devices = []
 
         outer_blocks = soup.select('div.cPHDOP.col-12-12')
@@ -0,0 +1,178 @@
+"""Pluggable HTML parser backends for parse_page.
+
+Every scraper builds its soup through make_soup, so the backend can be
+switched between html.parser, lxml and selectolax from PARSER_CONFIG without
+touching parse_page. Compare backends on archived pages with:
+
+    python -m scraper.html_parser --source Quikr --limit 20
+"""
+import argparse
+import contextlib
+import io
+import re
+import threading
+import time
+import tracemalloc
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+try:
+    from config import PARSER_CONFIG
+except ImportError:
+    PARSER_CONFIG = {}
+
+BACKENDS = ("html.parser", "lxml", "selectolax")
+
+_override = threading.local()
+
+
+class SelectolaxNode:
+    """Wraps a selectolax node in the subset of the BeautifulSoup API parse_page uses"""
+
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, selector):
+        return [SelectolaxNode(n) for n in self.node.css(selector)]
+
+    def select_one(self, selector):
+        node = self.node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def find(self, name=None, **attrs):
+        selector = name or "*"
+        for key, value in attrs.items():
+            key = "class" if key == "class_" else key
+            selector += f'[{key}="{value}"]'
+        return self.select_one(selector)
+
+    def get_text(self, strip=False):
+        return self.node.text(strip=strip)
+
+    @property
+    def text(self):
+        return self.node.text()
+
+    @property
+    def attrs(self):
+        return self.node.attributes
+
+    def get(self, key, default=None):
+        return self.node.attributes.get(key, default)
+
+    def __getitem__(self, key):
+        return self.node.attributes[key]
+
+
+def class_pattern(*names):
+    """Match a raw class attribute containing any of the given classes.
+
+    SoupStrainer sees class="a b" as one string while parsing, so
+    class_='a' alone would miss elements carrying several classes.
+    """
+    return re.compile(r"(?:^|\s)(?:%s)(?:\s|$)" % "|".join(map(re.escape, names)))
+
+
+def current_backend():
+    backend = getattr(_override, "backend", None) or PARSER_CONFIG.get("backend", "lxml")
+    if backend == "selectolax" and not HAS_SELECTOLAX:
+        backend = "lxml"
+    if backend == "lxml" and not HAS_LXML:
+        backend = "html.parser"
+    return backend
+
+
+@contextlib.contextmanager
+def use_backend(backend):
+    """Temporarily force a backend for make_soup calls on this thread"""
+    previous = getattr(_override, "backend", None)
+    _override.backend = backend
+    try:
+        yield
+    finally:
+        _override.backend = previous
+
+
+def make_soup(html, parse_only=None):
+    """Parse HTML with the configured backend.
+
+    parse_only is a bs4 SoupStrainer limiting the tree to the product
+    containers; it is ignored by selectolax, which parses the whole page.
+    """
+    backend = current_backend()
+    if backend == "selectolax":
+        return SelectolaxNode(LexborHTMLParser(html).root)
+    if not PARSER_CONFIG.get("partial", True):
+        parse_only = None
+    return BeautifulSoup(html, backend, parse_only=parse_only)
+
+
+def benchmark(source_name, pages, backends=BACKENDS):
+    """Time each backend over the same pages with that source's parse_page.
+
+    Peak memory is the Python-heap peak from tracemalloc; memory held inside
+    libxml2 or lexbor is not counted.
+    """
+    from .registry import parse_html
+
+    results = []
+    for backend in backends:
+        if (backend == "lxml" and not HAS_LXML) or (backend == "selectolax" and not HAS_SELECTOLAX):
+            print(f"⚠️ {backend} is not installed, skipping")
+            continue
+
+        devices = 0
+        with use_backend(backend), contextlib.redirect_stdout(io.StringIO()):
+            tracemalloc.start()
+            started = time.perf_counter()
+            for html in pages:
+                devices += len(parse_html(source_name, html))
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        results.append({
+            "backend": backend,
+            "pages": len(pages),
+            "devices": devices,
+            "seconds": round(elapsed, 3),
+            "ms_per_page": round(elapsed * 1000 / max(1, len(pages)), 1),
+            "peak_mb": round(peak / 1024 / 1024, 1),
+        })
+    return results
+
+
+def main():
+    from .registry import SCRAPER_CLASSES
+    from .snapshots import get_archive
+
+    parser = argparse.ArgumentParser(description="Compare HTML parser backends on archived pages")
+    parser.add_argument("--source", required=True, choices=sorted(SCRAPER_CLASSES))
+    parser.add_argument("--limit", type=int, default=20, help="most recent snapshots to parse")
+    args = parser.parse_args()
+
+    archive = get_archive()
+    digests = list(dict.fromkeys(e["sha256"] for e in archive.entries(source=args.source)))
+    pages = [archive.load(d) for d in digests[-args.limit:]]
+    if not pages:
+        print(f"No archived pages for {args.source}")
+        return
+
+    print(f"{'backend':<12} {'pages':>6} {'devices':>8} {'ms/page':>9} {'peak MB':>8}")
+    for r in benchmark(args.source, pages):
+        print(f"{r['backend']:<12} {r['pages']:>6} {r['devices']:>8} {r['ms_per_page']:>9} {r['peak_mb']:>8}")
+
+
+if __name__ == "__main__":
+    main()
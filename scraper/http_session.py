@@ -0,0 +1,108 @@
+import threading
+from urllib.parse import urlsplit, urlencode
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from config import HTTP_CONFIG
+except ImportError:
+    HTTP_CONFIG = {}
+
+DEFAULT_TIMEOUT = (5, 20)  # (connect, read) seconds
+
+_sessions = {}
+_validators = {}
+_lock = threading.Lock()
+
+
+def _build_session():
+    """Create a keep-alive session with a tuned connection pool and retry/backoff"""
+    retry = Retry(
+        total=HTTP_CONFIG.get("retries", 3),
+        backoff_factor=HTTP_CONFIG.get("backoff_factor", 0.5),
+        # 429/503 are left to the rate limiter, which backs the whole host off
+        status_forcelist=(500, 502, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_CONFIG.get("pool_connections", 4),
+        pool_maxsize=HTTP_CONFIG.get("pool_maxsize", 8),
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(url):
+    """Return the shared session for the url's host, creating it on first use"""
+    host = urlsplit(url).netloc
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = _sessions[host] = _build_session()
+        return session
+
+
+def _cache_key(url, params):
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+def capped_timeout(limit):
+    """The configured (connect, read) timeout with neither part above limit seconds"""
+    timeout = HTTP_CONFIG.get("timeout", DEFAULT_TIMEOUT)
+    if not isinstance(timeout, (tuple, list)):
+        timeout = (timeout, timeout)
+    if limit is None:
+        return tuple(timeout)
+    return tuple(min(t, limit) for t in timeout)
+
+
+def fetch(url, params=None, headers=None, conditional=False, timeout=None):
+    """GET a url through the pooled session for its host.
+
+    With conditional=True the ETag/Last-Modified seen on the previous 200 for
+    the same url and params is sent back, so an unchanged page comes back as a
+    bodiless 304. The body of that 200 is kept with its validators; on a 304
+    callers get it from cached_body().
+    """
+    key = _cache_key(url, params)
+    headers = dict(headers or {})
+
+    if conditional:
+        with _lock:
+            cached = _validators.get(key, {})
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = get_session(url).get(
+        url,
+        params=params,
+        headers=headers,
+        timeout=timeout or HTTP_CONFIG.get("timeout", DEFAULT_TIMEOUT),
+    )
+
+    if conditional and response.status_code == 200:
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        if any(validators.values()):
+            with _lock:
+                _validators[key] = {**validators, "body": response.text}
+
+    return response
+
+
+def cached_body(url, params=None):
+    """Body of the last 200 seen for a conditional fetch of url and params, or None"""
+    with _lock:
+        return _validators.get(_cache_key(url, params), {}).get("body")
@@ -1,27 +1,30 @@
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
+from .html_parser import make_soup, class_pattern
+from . import page_state
+from bs4 import SoupStrainer
 import re
 from utils.normalization import normalize_brand, normalize_condition, extract_model
-import time
 
 class MapleScraper(BaseScraper):
+    parse_only = SoupStrainer('li', class_=class_pattern('card'))
+
     def __init__(self):
         super().__init__("Maple")
         from config import SCRAPER_CONFIG
         self.config = SCRAPER_CONFIG["maple"]
 
-    def scrape(self):
+    def scrape_iter(self):
         try:
-            all_devices = []
             base_url = f"{self.config['base_url']}/collection/iphone"
             per_page = 8
 
             # Step 1: Fetch the first page to determine total number of pages
+            # (plain HTTP when the Next.js page state is embedded, browser otherwise)
             first_url = f"{base_url}?offset=1&perpage={per_page}"
-            first_html = self.get_page(first_url, use_selenium=True)
+            first_html = self.get_page_with_state(first_url)
 
             # Step 2: Extract total number of pages dynamically
-            soup = BeautifulSoup(first_html, 'html.parser')
+            soup = make_soup(first_html)
             pagination_links = soup.select('ul.Pagination_pagination__WK02Q li.Pagination_pageItem__8Jvhv a')
 
             total_pages = 1  # Fallback
@@ -29,34 +32,53 @@ class MapleScraper(BaseScraper):
                 text = a.text.strip()
                 if text.isdigit():
                     total_pages = max(total_pages, int(text))
+            total_pages = max(total_pages, page_state.find_page_count(first_html) or 1)
 
             print(f"Total pages detected: {total_pages}")
 
-            # Step 3: Loop through all pages using offset
-            for page_num in range(1, total_pages + 1):  # offset = page_num
-                paged_url = f"{base_url}?offset={page_num}&perpage={per_page}"
-                print(f"Fetching page {page_num}: {paged_url}")
-
-                html_content = self.get_page(paged_url, use_selenium=True)
-                devices = self.parse_page(html_content)
-
-                if not devices:
-                    print(f"No devices found at page {page_num}. Stopping early.")
-                    break
+            # Step 3: Page 1 is already here; fan the remaining offsets out over workers
+            devices = self.wait_for(self.parse_async(first_html))
+            if not devices:
+                print("No devices found at page 1. Stopping early.")
+                return
+            yield devices
 
-                all_devices.extend(devices)
-                time.sleep(1)
-
-            return all_devices
+            self.close_selenium()
+            paged_urls = [
+                f"{base_url}?offset={page_num}&perpage={per_page}"
+                for page_num in range(2, total_pages + 1)
+            ]
+            yield from self.fetch_pages(paged_urls, use_selenium=True, embedded_state=True)
 
         except Exception as e:
             print(f"Maple scraper error: {str(e)}")
-            return []
+            raise
         finally:
             self.cleanup()
 
+    def parse_state_products(self, products):
+        devices = []
+        for product in products:
+            devices.append({
+                'source': self.source_name,
+                'brand': normalize_brand("Apple"),
+                'model': extract_model(product['name']),
+                'condition': normalize_condition(product['condition']),
+                'price': product['price']
+            })
+        print(f"Returning {len(devices)} devices from page state")
+        return devices
+
+    def state_is_usable(self, products):
+        """Only when every product carries its condition; otherwise it is read from the DOM"""
+        return bool(products) and all(product['condition'] for product in products)
+
     def parse_page(self, html_content):
-        soup = BeautifulSoup(html_content, 'html.parser')
+        products = page_state.extract_products(html_content)
+        if self.state_is_usable(products):
+            return self.parse_state_products(products)
+
+        soup = self.make_soup(html_content)
         devices = []
 
         device_containers = soup.select('li.card')
@@ -1,52 +1,93 @@
 import json
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from .html_parser import class_pattern
+from . import shopify
 import re
-import time
 from utils.normalization import normalize_brand, normalize_condition, extract_model
 
 class MobileGooScraper(BaseScraper):
+    parse_only = SoupStrainer(['div', 'a'], class_=class_pattern('mt-3', 'pagination__item--next'))
+    collection = "mobiles"
+
     def __init__(self):
         super().__init__("MobileGoo")
         from config import SCRAPER_CONFIG
         self.config = SCRAPER_CONFIG["mobilegoo"]
 
-    def scrape(self):
+    def scrape_iter(self):
         try:
-            all_devices = []
-            base_url = f"{self.config['base_url']}/collections/mobiles"
-            current_url = base_url
-            visited_cursors = set()
+            yield from shopify.with_html_fallback(self.scrape_catalog, self.scrape_html)
+        except Exception as e:
+            print(f"MobileGoo scraper error: {str(e)}")
+            raise
+        finally:
+            self.cleanup()
 
-            while True:
-                print(f"Fetching: {current_url}")
-                html = self.get_page(current_url, use_selenium=True)
-                devices, next_cursor = self.parse_page(html)
+    def scrape_catalog(self):
+        """Page through the collection's products.json over plain HTTP"""
+        pages = shopify.iter_products_pages(self, self.config['base_url'], self.collection)
+        for devices, _ in self.parse_pipelined(pages):
+            yield devices
 
-                if not devices:
-                    print("No devices found, stopping.")
-                    break
+    def scrape_html(self):
+        base_url = f"{self.config['base_url']}/collections/{self.collection}"
+        current_url = base_url
+        visited_cursors = set()
 
-                all_devices.extend(devices)
+        while True:
+            print(f"Fetching: {current_url}")
+            html = self.get_page(current_url, use_selenium=True)
+            devices, next_cursor = self.wait_for(self.parse_async(html))
 
-                if not next_cursor or next_cursor in visited_cursors:
-                    print("No next cursor or already visited. Done.")
-                    break
+            if not devices:
+                print("No devices found, stopping.")
+                break
 
-                visited_cursors.add(next_cursor)
-                current_url = f"{base_url}?phcursor={next_cursor}"
-                time.sleep(1)
+            yield devices
 
-            return all_devices
+            if not next_cursor or next_cursor in visited_cursors:
+                print("No next cursor or already visited. Done.")
+                break
 
-        except Exception as e:
-            print(f"MobileGoo scraper error: {str(e)}")
-            return []
-        finally:
-            self.cleanup()
+            visited_cursors.add(next_cursor)
+            current_url = f"{base_url}?phcursor={next_cursor}"
+
+    def parse_catalog_page(self, content):
+        """One device per variant, condition from the variant's Condition option"""
+        devices = []
+        for product in shopify.parse_products(content):
+            try:
+                device_name = product.get("title", "").strip()
+                if not device_name:
+                    continue
+
+                model = extract_model(device_name)
+                brand = normalize_brand("Apple")
+
+                for variant in product.get("variants", []):
+                    price = shopify.variant_price(variant)
+                    if not price:
+                        continue
+                    raw_cond = shopify.variant_option(product, variant, "condition", fallback="option3")
+
+                    devices.append({
+                        'source': self.source_name,
+                        'brand':   brand,
+                        'model':   model,
+                        'condition': normalize_condition(raw_cond),
+                        'price':   price
+                    })
+            except Exception as e:
+                print(f"Error parsing product: {e}")
+        print(f"Returning {len(devices)}")
+        return devices, None
 
     def parse_page(self, html_content):
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if shopify.is_products_json(html_content):
+            return self.parse_catalog_page(html_content)
+
+        soup = self.make_soup(html_content)
         devices = []
 
         # 1) Select each product block by its outer container
@@ -68,6 +109,12 @@ class MobileGooScraper(BaseScraper):
 
                 variants = json.loads(script.text)
 
+                # extract model from the human name (same for every variant)
+                model = extract_model(device_name)
+
+                # brand—still hardcoded or derived as you prefer
+                brand = normalize_brand("Apple")
+
                 for variant in variants:
                     # JSON price is in paise → divide by 100 for ₹
                     raw_price = variant.get('price', 0)
@@ -77,12 +124,6 @@ class MobileGooScraper(BaseScraper):
                     raw_cond = variant.get('option3', '')
                     condition = normalize_condition(raw_cond)
 
-                    # extract model from the human name
-                    model = extract_model(device_name)
-
-                    # brand—still hardcoded or derived as you prefer
-                    brand = normalize_brand("Apple")
-
                     devices.append({
                         'source': self.source_name,
                         'brand':   brand,
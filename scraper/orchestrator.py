@@ -0,0 +1,166 @@
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from . import supervisor
+
+try:
+    from config import ORCHESTRATOR_CONFIG
+except ImportError:
+    ORCHESTRATOR_CONFIG = {}
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_TIMEOUT = 900  # seconds per scraper, counted from when it starts running
+DEFAULT_MAX_QUEUED_BATCHES = 16
+ABANDON_GRACE = 30  # seconds past a deadline before a scraper that hasn't stopped is abandoned
+
+
+def run_scrapers(scrapers, on_batch, max_workers=None, timeouts=None, breaker=None, force=False,
+                 run_timeout=None):
+    """Run scrapers concurrently and hand each device batch to on_batch as it arrives.
+
+    scrapers: dict of name -> callable returning an iterable of device batches
+              (e.g. a scraper's scrape_iter())
+    on_batch: callable(name, devices) -> number of records added; always called
+              from this thread, so database writes are never concurrent
+    timeouts: optional dict of name -> seconds, overriding the default deadline
+    breaker:  CircuitBreaker consulted before and updated after each scraper
+              (defaults to the shared one); force=True runs open sources anyway
+    run_timeout: seconds for the whole run; scrapers still queued when it
+              passes are skipped and no scraper's deadline extends beyond it
+
+    Returns a dict of name -> summary (status, devices, added, elapsed, error).
+    Status is ok, failed, timeout or skipped.
+    """
+    max_workers = max_workers or ORCHESTRATOR_CONFIG.get("max_workers", DEFAULT_MAX_WORKERS)
+    default_timeout = ORCHESTRATOR_CONFIG.get("timeout", DEFAULT_TIMEOUT)
+    timeouts = {**ORCHESTRATOR_CONFIG.get("timeouts", {}), **(timeouts or {})}
+    breaker = breaker or supervisor.get_circuit_breaker()
+    run_timeout = run_timeout or ORCHESTRATOR_CONFIG.get("run_timeout")
+    run_started = time.monotonic()
+    run_deadline = run_started + run_timeout if run_timeout else None
+
+    # Bounded so a fast scraper can't pile up batches faster than they're written
+    events = queue.Queue(maxsize=ORCHESTRATOR_CONFIG.get("max_queued_batches", DEFAULT_MAX_QUEUED_BATCHES))
+    started = {}
+    abandoned = set()
+    summary = {
+        name: {"status": "pending", "devices": 0, "added": 0, "elapsed": 0.0, "error": None}
+        for name in scrapers
+    }
+
+    def emit(name, kind, payload=None):
+        while name not in abandoned:
+            try:
+                events.put((name, kind, payload), timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def deadline_for(name):
+        deadline = started[name] + timeouts.get(name, default_timeout)
+        return min(deadline, run_deadline) if run_deadline else deadline
+
+    def run(name, fn):
+        started[name] = time.monotonic()
+        batches = None
+        if name in abandoned:
+            return
+        if run_deadline and started[name] >= run_deadline:
+            emit(name, "skipped", "run deadline passed before it started")
+            return
+        try:
+            # The scraper built by fn() picks this deadline up and checks it on every fetch
+            with supervisor.deadline(deadline_for(name) - started[name]):
+                batches = fn()
+                for batch in batches:
+                    if batch and not emit(name, "batch", batch):
+                        return
+            if time.monotonic() >= deadline_for(name):
+                emit(name, "timeout", "deadline reached before the last page")
+            else:
+                emit(name, "done")
+        except supervisor.DeadlineExceeded as e:
+            emit(name, "timeout", str(e))
+        except Exception as e:
+            emit(name, "failed", str(e))
+        finally:
+            # Closing a scrape_iter generator runs its cleanup (browser release)
+            if hasattr(batches, "close"):
+                batches.close()
+
+    def finish(name, status, error=None):
+        summary[name]["status"] = status
+        summary[name]["error"] = error
+        summary[name]["elapsed"] = round(time.monotonic() - started.get(name, time.monotonic()), 1)
+        if status == "skipped":
+            return
+        if error is not None:
+            reason = f"{status}: {error}"
+        elif summary[name]["devices"] == 0:
+            reason = "finished without any devices"
+        else:
+            breaker.record_success(name)
+            return
+        if breaker.record_failure(name, reason):
+            print(f"🔌 Circuit opened for {name}: {reason}")
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scraper")
+    running = set()
+    for name, fn in scrapers.items():
+        allowed, reason = breaker.allow(name)
+        if not allowed and not force:
+            finish(name, "skipped", reason)
+            print(f"⏭️ Skipping {name}: {reason}")
+            continue
+        executor.submit(run, name, fn)
+        running.add(name)
+
+    try:
+        while running:
+            try:
+                name, kind, payload = events.get(timeout=1)
+            except queue.Empty:
+                name = kind = None
+
+            if name in running:
+                if kind == "batch":
+                    try:
+                        added = on_batch(name, payload)
+                    except Exception as e:
+                        added = 0
+                        print(f"❌ Failed to store {name} batch: {e}")
+                    summary[name]["devices"] += len(payload)
+                    summary[name]["added"] += added
+                elif kind == "done":
+                    running.discard(name)
+                    finish(name, "ok")
+                    print(f"✅ {name}: {summary[name]['devices']} devices, {summary[name]['added']} added")
+                elif kind in ("failed", "timeout", "skipped"):
+                    running.discard(name)
+                    finish(name, kind, payload)
+                    print(f"❌ {name} scraper {kind}: {payload}")
+
+            # A worker thread can't be killed; an overdue scraper is abandoned and
+            # stops at its next batch. Batches already written are kept.
+            now = time.monotonic()
+            for name in list(running):
+                if name not in started:
+                    # Still queued behind scrapers that won't give their worker back
+                    if run_deadline and now > run_deadline + ABANDON_GRACE:
+                        running.discard(name)
+                        abandoned.add(name)
+                        finish(name, "skipped", "run deadline passed before it started")
+                        print(f"⏭️ {name} never started before the run deadline")
+                    continue
+                # Grace period for the scraper to notice its own deadline and stop cleanly
+                if now > deadline_for(name) + ABANDON_GRACE:
+                    running.discard(name)
+                    abandoned.add(name)
+                    finish(name, "timeout", f"still running {ABANDON_GRACE}s after its deadline")
+                    print(f"⏱️ {name} scraper abandoned after its deadline")
+    finally:
+        abandoned.update(scrapers)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return summary
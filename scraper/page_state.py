@@ -0,0 +1,122 @@
+"""Read products from the state a server-rendered storefront embeds in its HTML.
+
+Next.js pages ship their props as JSON in <script id="__NEXT_DATA__">, and
+other client-rendered shops assign a hydration blob to window.__INITIAL_STATE__
+or similar. When that state is present a plain HTTP GET is enough; the
+browser is only needed when it isn't.
+"""
+import json
+import re
+
+_NEXT_DATA_RE = re.compile(r'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S)
+_STATE_ASSIGN_RE = re.compile(
+    r'window\.(?:__INITIAL_STATE__|__PRELOADED_STATE__|__APOLLO_STATE__|__NUXT__)\s*=\s*'
+)
+
+NAME_KEYS = ("name", "title", "productName", "product_name", "modelName", "displayName")
+PRICE_KEYS = (
+    "sellingPrice", "selling_price", "sellPrice", "sell_price", "salePrice", "sale_price",
+    "offerPrice", "offer_price", "discountedPrice", "finalPrice", "price",
+)
+CONDITION_KEYS = ("condition", "conditionName", "grade", "quality")
+PAGE_COUNT_KEYS = ("totalPages", "total_pages", "pageCount", "page_count", "lastPage", "last_page")
+
+
+def extract_page_state(html):
+    """Return the embedded page-state JSON, or None if the page has none"""
+    if not html:
+        return None
+
+    match = _NEXT_DATA_RE.search(html)
+    if match:
+        try:
+            return json.loads(match.group(1))
+        except ValueError:
+            pass
+
+    decoder = json.JSONDecoder()
+    for match in _STATE_ASSIGN_RE.finditer(html):
+        try:
+            return decoder.raw_decode(html, match.end())[0]
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_price(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value > 0 else None
+    if isinstance(value, str):
+        match = re.search(r'\d[\d,]*(\.\d+)?', value)
+        return float(match.group().replace(',', '')) if match else None
+    if isinstance(value, dict):
+        for key in ("amount", "value", "selling", "sale", "final"):
+            if key in value:
+                return _parse_price(value[key])
+    return None
+
+
+def _first(obj, keys, convert=None):
+    for key in keys:
+        value = obj.get(key)
+        if convert:
+            value = convert(value)
+        if value:
+            return value
+    return None
+
+
+def product_fields(obj):
+    """(name, price, condition) if a state object looks like a product listing"""
+    name = _first(obj, NAME_KEYS, lambda v: v.strip() if isinstance(v, str) else None)
+    price = _first(obj, PRICE_KEYS, _parse_price)
+    if not name or not price:
+        return None
+    condition = _first(obj, CONDITION_KEYS, lambda v: v if isinstance(v, str) else None)
+    return {"name": name, "price": price, "condition": condition}
+
+
+def _walk(state):
+    stack = [state]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            yield node
+            stack.extend(node)
+
+
+def find_products(state):
+    """The largest list in the state whose items mostly look like products"""
+    best = []
+    for node in _walk(state):
+        if not isinstance(node, list) or len(node) <= len(best):
+            continue
+        products = [p for p in (product_fields(i) for i in node if isinstance(i, dict)) if p]
+        if len(products) > len(best) and len(products) * 2 >= len(node):
+            best = products
+    return best
+
+
+def extract_products(html):
+    """Products from a page's embedded state ([] if there is no usable state)"""
+    state = extract_page_state(html)
+    return find_products(state) if state is not None else []
+
+
+def find_page_count(html):
+    """Total page count advertised in the embedded state, if any"""
+    state = extract_page_state(html)
+    if state is None:
+        return None
+    for node in _walk(state):
+        if isinstance(node, dict):
+            for key in PAGE_COUNT_KEYS:
+                value = node.get(key)
+                if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+                    return value
+    return None
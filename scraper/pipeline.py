@@ -0,0 +1,138 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from utils.normalization import cache_stats
+from . import supervisor
+
+try:
+    from config import PIPELINE_CONFIG
+except ImportError:
+    PIPELINE_CONFIG = {}
+
+
+def _parse_inline(parse_page, html):
+    future = Future()
+    try:
+        future.set_result(parse_page(html))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+class ParsePipeline:
+    """Hands fetched HTML from scraper threads to a process pool of parsers.
+
+    At most max_pending pages may be queued or parsing at once; a fetcher
+    that would exceed that blocks in submit until a parser frees a slot, which
+    keeps raw HTML held in memory bounded. Scrapers that submit pages as they
+    fetch them (BaseScraper.parse_pipelined, fetch_pages workers) overlap
+    fetching and parsing; a scraper that needs a page's result before it can
+    fetch the next (MobileGoo's cursor walk) only moves parsing off the GIL.
+    Each parse also reports its worker's normalization cache stats, kept per
+    worker process for normalization_cache_stats.
+    """
+
+    def __init__(self, workers=None, max_pending=8):
+        self.workers = workers
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.lock = threading.Lock()
+        self.executor = None
+        self.worker_cache_stats = {}
+
+    def _executor(self):
+        with self.lock:
+            if self.executor is None:
+                # Not fork: the parent runs browser, scraper and UI threads, and a
+                # forked child can inherit a lock one of them holds (e.g. stdout's)
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self.executor
+
+    def submit(self, source_name, html, timeout=None):
+        """Queue a page for parsing; returns a Future of parse_page's result.
+
+        Raises TimeoutError if no slot frees up within timeout seconds.
+        """
+        from .registry import parse_page_with_stats
+
+        if not self.slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No parser slot free within {timeout:.1f}s")
+        try:
+            parsed = self._executor().submit(parse_page_with_stats, source_name, html)
+        except BrokenProcessPool:
+            # A crashed parser takes the pool with it; start a fresh one next time
+            with self.lock:
+                self.executor = None
+            self.slots.release()
+            raise
+        except Exception:
+            self.slots.release()
+            raise
+        future = Future()
+
+        def done(parsed):
+            self.slots.release()
+            try:
+                result, pid, stats = parsed.result()
+            except BaseException as e:
+                future.set_exception(e)
+                return
+            with self.lock:
+                self.worker_cache_stats[pid] = stats
+            future.set_result(result)
+
+        parsed.add_done_callback(done)
+        return future
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline():
+    """Shared parse pipeline for every scraper in this process"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = ParsePipeline(
+                workers=PIPELINE_CONFIG.get("parse_workers"),
+                max_pending=PIPELINE_CONFIG.get("max_pending", 8),
+            )
+        return _pipeline
+
+
+def normalization_cache_stats():
+    """Normalization cache hits, misses and sizes summed over the parser workers and this process"""
+    snapshots = [cache_stats()]
+    if _pipeline is not None:
+        with _pipeline.lock:
+            snapshots.extend(_pipeline.worker_cache_stats.values())
+    totals = {}
+    for snapshot in snapshots:
+        for name, counts in snapshot.items():
+            total = totals.setdefault(name, dict.fromkeys(counts, 0))
+            for key, value in counts.items():
+                total[key] += value
+    return totals
+
+
+def parse_async(scraper, html):
+    """Parse a scraper's page in the process pool, or inline if that isn't possible"""
+    from .registry import SCRAPER_CLASSES
+
+    if not PIPELINE_CONFIG.get("enabled", True) or type(scraper) is not SCRAPER_CLASSES.get(scraper.source_name):
+        return _parse_inline(scraper.parse_page, html)
+    try:
+        with supervisor.waiting_for("a parser slot"):
+            return get_pipeline().submit(scraper.source_name, html, timeout=scraper.time_left())
+    except BrokenProcessPool as e:
+        print(f"⚠️ Parser pool failed ({e}), parsing inline")
+        return _parse_inline(scraper.parse_page, html)
@@ -1,37 +1,42 @@
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
-import time
+from .snapshots import archive_page
+from bs4 import SoupStrainer
+from .html_parser import class_pattern
 import re
 from utils.normalization import normalize_brand, normalize_condition, extract_model
 
 class QuikrScraper(BaseScraper):
+    parse_only = SoupStrainer('div', class_=class_pattern('relatedSnbProducts'))
+
     def __init__(self):
         super().__init__("Quikr")
         from config import SCRAPER_CONFIG
         self.config = SCRAPER_CONFIG["quikr"]
 
-    def scrape(self):
+    def scrape_iter(self):
         try:
             url = self.config['base_url']
-            html = self.get_page_with_scroll(url, max_scrolls=15)
-            devices = self.parse_page(html)
-            return devices
+            html = self.get_page_with_scroll(url, **self.config.get("scroll", {}))
+            yield self.wait_for(self.parse_async(html))
         except Exception as e:
             print(f"Quikr scraper error: {e}")
-            return []
+            raise
         finally:
             self.cleanup()
 
-    def get_page_with_scroll(self, url, max_scrolls=10):
-        self.get_page(url, use_selenium=True)
-        for i in range(max_scrolls):
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            print(f"⬇️ Scrolled {i+1}/{max_scrolls}")
-        return self.driver.page_source
+    def get_page_with_scroll(self, url, max_scrolls=15, quiet_period=3.0):
+        self.get_page(url, use_selenium=True, archive=False)
+        html, added_per_scroll = self.scroll_until_stable(
+            item_selector='div.relatedSnbProducts.srpProducts',
+            quiet_period=quiet_period,
+            max_scrolls=max_scrolls,
+        )
+        print(f"📜 Listings added per scroll: {added_per_scroll}")
+        archive_page(self.source_name, url, html)
+        return html
 
     def parse_page(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.make_soup(html)
         cards = soup.select('div.relatedSnbProducts.srpProducts')
         print(f"🔍 Found {len(cards)} listings")
 
@@ -0,0 +1,97 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+try:
+    from config import SCRAPER_CONFIG
+except ImportError:
+    SCRAPER_CONFIG = {}
+
+DEFAULT_RATE_LIMIT = {
+    "rate": 0.5,          # requests per second once the burst is spent
+    "burst": 3,           # requests allowed back to back
+    "max_backoff": 120,   # seconds, cap for 429/503 backoff
+}
+
+
+class TokenBucket:
+    """Token bucket for one host that backs off when the host pushes back"""
+
+    def __init__(self, rate, burst, max_backoff=DEFAULT_RATE_LIMIT["max_backoff"]):
+        self.rate = rate
+        self.burst = burst
+        self.max_backoff = max_backoff
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.backoff = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, timeout=None):
+        """Take one token, sleeping only if the budget is used up. Returns seconds waited.
+
+        Raises TimeoutError instead of sleeping past timeout seconds.
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            if timeout is not None and waited + wait > timeout:
+                raise TimeoutError(f"No request slot within {timeout:.1f}s")
+            time.sleep(wait)
+            waited += wait
+
+    def report(self, status_code, retry_after=None):
+        """Feed back a response status; 429/503 pause the host with exponential backoff"""
+        with self.lock:
+            if status_code in (429, 503):
+                self.backoff = min(self.max_backoff, self.backoff * 2 if self.backoff else 1 / self.rate)
+                delay = min(retry_after, self.max_backoff) if retry_after is not None else self.backoff
+                self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+                self.tokens = 0
+                print(f"🐢 Backing off for {delay:.1f}s (HTTP {status_code})")
+            elif status_code < 400:
+                self.backoff = 0.0
+
+
+class RateLimiter:
+    """Per-host token buckets configured from SCRAPER_CONFIG[...]["rate_limit"]"""
+
+    def __init__(self, scraper_config):
+        self.host_limits = {}
+        for site in scraper_config.values():
+            if "base_url" in site and "rate_limit" in site:
+                self.host_limits[urlsplit(site["base_url"]).netloc] = site["rate_limit"]
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.buckets:
+                limits = {**DEFAULT_RATE_LIMIT, **self.host_limits.get(host, {})}
+                self.buckets[host] = TokenBucket(limits["rate"], limits["burst"], limits["max_backoff"])
+            return self.buckets[host]
+
+    def acquire(self, url, timeout=None):
+        return self.bucket(url).acquire(timeout)
+
+    def report(self, url, status_code, retry_after=None):
+        if isinstance(retry_after, str):
+            retry_after = float(retry_after) if retry_after.strip().isdigit() else None
+        self.bucket(url).report(status_code, retry_after)
+
+
+rate_limiter = RateLimiter(SCRAPER_CONFIG)
@@ -1,27 +1,66 @@
 from .base_scraper import BaseScraper
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from .html_parser import class_pattern
+from . import shopify
 import re
 from utils.normalization import normalize_brand, normalize_condition, extract_model
 
 class RefitScraper(BaseScraper):
+    parse_only = SoupStrainer('div', class_=class_pattern('product-card-wrapper'))
+    collection = "all-refurbished-mobile-phones"
+
     def __init__(self):
         super().__init__("RefitGlobal")
         from config import SCRAPER_CONFIG
         self.config = SCRAPER_CONFIG["refitGlobal"]
 
-    def scrape(self):
+    def scrape_iter(self):
         try:
-            url = f"{self.config['base_url']}/collections/all-refurbished-mobile-phones"
-            html_content = self.get_page(url, use_selenium=False)
-            return self.parse_page(html_content)
+            yield from shopify.with_html_fallback(self.scrape_catalog, self.scrape_html)
         except Exception as e:
             print(f"Refit scraper error: {str(e)}")
-            return []
+            raise
         finally:
             self.cleanup()
 
+    def scrape_catalog(self):
+        """Page through the collection's products.json over plain HTTP"""
+        pages = shopify.iter_products_pages(self, self.config['base_url'], self.collection)
+        yield from self.parse_pipelined(pages)
+
+    def scrape_html(self):
+        url = f"{self.config['base_url']}/collections/{self.collection}"
+        html_content = self.get_page(url, use_selenium=False, conditional=True)
+        if html_content is not None:
+            yield self.wait_for(self.parse_async(html_content))
+
+    def parse_catalog_page(self, content):
+        """One device per product at its lowest variant price, like the collection cards"""
+        devices = []
+        for product in shopify.parse_products(content):
+            try:
+                device_name = product.get("title", "").strip()
+                prices = [p for p in map(shopify.variant_price, product.get("variants", [])) if p]
+                if not device_name or not prices:
+                    continue
+
+                devices.append({
+                    'source': self.source_name,
+                    'brand': normalize_brand(device_name.split()[0]),
+                    'model': extract_model(device_name),
+                    'condition': normalize_condition("Refurbished"),
+                    'price': min(prices)
+                })
+            except Exception as e:
+                print(f"Error processing product: {str(e)}")
+        print(f"Returning {len(devices)}")
+        return devices
+
     def parse_page(self, html_content):
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if shopify.is_products_json(html_content):
+            return self.parse_catalog_page(html_content)
+
+        soup = self.make_soup(html_content)
         devices = []
 
         containers = soup.select('div.card-wrapper.product-card-wrapper')
@@ -0,0 +1,39 @@
+import os
+from utils.normalization import cache_stats
+from .cashify import CashifyScraper
+from .maple import MapleScraper
+from .refitglobal import RefitScraper
+from .mobilegoo import MobileGooScraper
+from .amazon import AmazonRenewedScraper
+from .flipkart import FlipkartScraper
+from .quikr import QuikrScraper
+
+# Keyed by the source name each scraper writes into device_data
+SCRAPER_CLASSES = {
+    "Cashify": CashifyScraper,
+    "Maple": MapleScraper,
+    "RefitGlobal": RefitScraper,
+    "MobileGoo": MobileGooScraper,
+    "AmazonRenewed": AmazonRenewedScraper,
+    "Flipkart": FlipkartScraper,
+    "Quikr": QuikrScraper,
+}
+
+
+def parse_page_result(source_name, html):
+    """Run a source's parse_page over raw HTML (used by parser worker processes)"""
+    return SCRAPER_CLASSES[source_name]().parse_page(html)
+
+
+def parse_page_with_stats(source_name, html):
+    """parse_page_result plus this process's id and normalization cache stats, for parser workers"""
+    return parse_page_result(source_name, html), os.getpid(), cache_stats()
+
+
+def parse_html(source_name, html):
+    """Run a source's parse_page over raw HTML and return just the device list"""
+    result = parse_page_result(source_name, html)
+    # MobileGoo also returns its next pagination cursor
+    if isinstance(result, tuple):
+        result = result[0]
+    return result
@@ -0,0 +1,72 @@
+"""Re-run parse_page over archived snapshots without touching the network.
+
+    python -m scraper.reparse --source Flipkart --since 2025-01-01 --ingest
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import pandas as pd
+from .snapshots import get_archive
+from .registry import SCRAPER_CLASSES, parse_html
+
+
+def reparse_entry(entry):
+    """Parse one archived page, stamping devices with the original fetch time"""
+    try:
+        html = get_archive().load(entry["sha256"])
+        devices = parse_html(entry["source"], html)
+    except Exception as e:
+        print(f"❌ Failed to re-parse {entry['url']} ({entry['sha256'][:12]}): {e}")
+        return []
+
+    fetched_at = datetime.fromisoformat(entry["fetched_at"])
+    for device in devices:
+        device["date_scraped"] = fetched_at
+    return devices
+
+
+def reparse(source=None, since=None, until=None, workers=None):
+    """Re-parse archived snapshots in bulk on all cores and return the devices"""
+    entries = [
+        entry for entry in get_archive().entries(source=source, since=since, until=until)
+        if entry["source"] in SCRAPER_CLASSES
+    ]
+    print(f"🗂️ Re-parsing {len(entries)} snapshots")
+    if not entries:
+        return []
+
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(entries) // (workers * 4))
+    all_devices = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for devices in executor.map(reparse_entry, entries, chunksize=chunksize):
+            all_devices.extend(devices)
+    print(f"Returning {len(all_devices)}")
+    return all_devices
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-parse archived pages offline")
+    parser.add_argument("--source", choices=sorted(SCRAPER_CLASSES), help="only this source")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="fetched at or after (ISO date)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="fetched at or before (ISO date)")
+    parser.add_argument("--workers", type=int, help="parser processes (default: all cores)")
+    parser.add_argument("--csv", help="write the re-parsed devices to this CSV file")
+    parser.add_argument("--ingest", action="store_true",
+                        help="add the re-parsed devices to the database, skipping rows it already holds")
+    args = parser.parse_args()
+
+    devices = reparse(args.source, args.since, args.until, args.workers)
+
+    if args.csv:
+        pd.DataFrame(devices).to_csv(args.csv, index=False)
+        print(f"💾 Wrote {len(devices)} rows to {args.csv}")
+    if args.ingest:
+        from database.operations import ingest_device_prices, DEDUP_WINDOW
+        # The live run stored its rows just after each fetch, so look past fetched_at too
+        ingest_device_prices(devices, lookahead=DEDUP_WINDOW)
+
+
+if __name__ == "__main__":
+    main()
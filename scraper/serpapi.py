@@ -0,0 +1,135 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from . import http_session
+from .rate_limiter import rate_limiter
+
+SERPAPI_ENDPOINT = "https://serpapi.com/search.json"
+
+
+def http_fetch(endpoint, params):
+    """Default transport: pooled, rate-limited GET returning the decoded JSON"""
+    rate_limiter.acquire(endpoint)
+    response = http_session.fetch(endpoint, params=params)
+    rate_limiter.report(endpoint, response.status_code, response.headers.get("Retry-After"))
+    response.raise_for_status()
+    return response.json()
+
+
+def params_key(params):
+    """Cache key for a request: a hash of its parameters without the API key"""
+    public = {k: v for k, v in params.items() if k != "api_key"}
+    return hashlib.sha256(json.dumps(public, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class RecordedFetch:
+    """Stand-in transport that replays responses recorded in a cache directory.
+
+    Cache entries double as recordings, so copying a cache_dir from a live run
+    gives a fixture: SerpApiClient(key, cache_dir=tmp, fetch=RecordedFetch(recorded))
+    """
+
+    def __init__(self, recordings_dir):
+        self.recordings_dir = Path(recordings_dir)
+        self.calls = []
+
+    def __call__(self, endpoint, params):
+        public = {k: v for k, v in params.items() if k != "api_key"}
+        self.calls.append(public)
+        path = self.recordings_dir / f"{params_key(params)}.json"
+        if not path.exists():
+            raise KeyError(f"No recorded response for {public}")
+        return json.loads(path.read_text(encoding="utf-8"))["response"]
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+class SerpApiClient:
+    """SerpApi searches with an on-disk TTL cache and a monthly call budget.
+
+    Responses are cached under cache_dir keyed by the request parameters (minus
+    the API key), so repeated runs within ttl seconds make no paid calls. Only
+    calls that reach SerpApi count against monthly_quota. Pass fetch to swap
+    the transport, e.g. for a stand-in that replays recorded responses.
+    """
+
+    def __init__(self, api_key, cache_dir="serpapi_cache", ttl=6 * 3600, monthly_quota=100,
+                 max_workers=4, endpoint=SERPAPI_ENDPOINT, fetch=http_fetch):
+        self.api_key = api_key
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.monthly_quota = monthly_quota
+        self.max_workers = max_workers
+        self.endpoint = endpoint
+        self.fetch = fetch
+        self.quota_path = self.cache_dir / "quota.json"
+        self.lock = threading.Lock()
+
+    def _read_cache(self, key):
+        path = self.cache_dir / f"{key}.json"
+        if not path.exists():
+            return None
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        if time.time() - entry["fetched_at"] > self.ttl:
+            return None
+        return entry["response"]
+
+    def _write_cache(self, key, params, response):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        public = {k: v for k, v in params.items() if k != "api_key"}
+        entry = {"fetched_at": time.time(), "params": public, "response": response}
+        tmp = self.cache_dir / f"{key}.tmp"
+        tmp.write_text(json.dumps(entry), encoding="utf-8")
+        tmp.replace(self.cache_dir / f"{key}.json")
+
+    def _reserve_call(self):
+        """Count one paid call against this month's budget, or raise QuotaExceeded"""
+        month = datetime.utcnow().strftime("%Y-%m")
+        with self.lock:
+            usage = {"month": month, "used": 0}
+            if self.quota_path.exists():
+                usage = json.loads(self.quota_path.read_text(encoding="utf-8"))
+                if usage.get("month") != month:
+                    usage = {"month": month, "used": 0}
+            if usage["used"] >= self.monthly_quota:
+                raise QuotaExceeded(f"SerpApi budget of {self.monthly_quota} calls used up for {month}")
+            usage["used"] += 1
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.quota_path.write_text(json.dumps(usage), encoding="utf-8")
+
+    def search(self, params):
+        """Return (response, from_cache) for one search"""
+        key = params_key(params)
+        cached = self._read_cache(key)
+        if cached is not None:
+            return cached, True
+
+        self._reserve_call()
+        response = self.fetch(self.endpoint, {**params, "api_key": self.api_key})
+        self._write_cache(key, params, response)
+        return response, False
+
+    def search_many(self, param_sets):
+        """Run searches concurrently, yielding (params, response, from_cache) as each finishes.
+
+        A failed or over-budget search is reported and skipped.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.search, params): params for params in param_sets}
+            for future in as_completed(futures):
+                params = futures[future]
+                try:
+                    response, from_cache = future.result()
+                except QuotaExceeded as e:
+                    print(f"⚠️ {e}; skipping {params}")
+                    continue
+                except Exception as e:
+                    print(f"❌ SerpApi error for {params}: {e}")
+                    continue
+                yield params, response, from_cache
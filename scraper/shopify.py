@@ -0,0 +1,76 @@
+"""Plain-HTTP catalog access for Shopify storefronts (RefitGlobal, MobileGoo).
+
+Shopify serves every collection as paged JSON at
+/collections/<handle>/products.json, which is far cheaper than rendering the
+collection page in a browser.
+"""
+import json
+import re
+
+PAGE_LIMIT = 250  # Shopify's maximum page size
+MAX_PAGES = 100
+
+_PRODUCTS_JSON_RE = re.compile(r'^\s*\{\s*"products"\s*:')
+
+
+def is_products_json(content):
+    """True if content is a products.json page rather than collection HTML"""
+    return bool(content) and bool(_PRODUCTS_JSON_RE.match(content[:100]))
+
+
+def products_json_url(base_url, collection):
+    return f"{base_url.rstrip('/')}/collections/{collection}/products.json"
+
+
+def iter_products_pages(scraper, base_url, collection, limit=PAGE_LIMIT, max_pages=MAX_PAGES):
+    """Yield the raw products.json pages of a collection, fetched through scraper.get_page.
+
+    Fetches are conditional, so a page Shopify reports unchanged is re-used
+    from the last fetch instead of downloaded again.
+    """
+    url = products_json_url(base_url, collection)
+    for page in range(1, max_pages + 1):
+        print(f"🛍️ Fetching Shopify catalog page {page}: {url}")
+        content = scraper.get_page(url, params={"limit": limit, "page": page}, conditional=True)
+        if not is_products_json(content):
+            raise ValueError(f"Not a Shopify products.json response: {url}")
+
+        yield content
+        if len(json.loads(content)["products"]) < limit:
+            break
+
+
+def parse_products(content):
+    """Products from one products.json page"""
+    return json.loads(content)["products"]
+
+
+def variant_price(variant):
+    """Variant price in ₹ (products.json prices are decimal strings in rupees)"""
+    price = variant.get("price")
+    return float(price) if price not in (None, "") else None
+
+
+def with_html_fallback(catalog_batches, html_batches):
+    """Yield batches from the catalog JSON path, or from the HTML path if it fails
+    or finds nothing before producing any devices"""
+    produced = False
+    try:
+        for devices in catalog_batches():
+            produced = produced or bool(devices)
+            yield devices
+    except Exception as e:
+        if produced:
+            raise
+        print(f"⚠️ Shopify catalog unavailable ({e}), falling back to HTML")
+    if not produced:
+        yield from html_batches()
+
+
+def variant_option(product, variant, option_name, fallback=None):
+    """Value of a named option (e.g. "Condition") for a variant"""
+    for position, option in enumerate(product.get("options") or [], start=1):
+        name = option.get("name", "") if isinstance(option, dict) else str(option)
+        if option_name.lower() in name.lower():
+            return variant.get(f"option{position}")
+    return variant.get(fallback) if fallback else None
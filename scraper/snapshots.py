@@ -0,0 +1,102 @@
+import hashlib
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+import zstandard
+
+try:
+    from config import SNAPSHOT_CONFIG
+except ImportError:
+    SNAPSHOT_CONFIG = {}
+
+
+class SnapshotArchive:
+    """Content-addressed, zstd-compressed store of fetched pages.
+
+    Page bodies live once under blobs/<sha256[:2]>/<sha256>.html.zst, so a page
+    that hasn't changed between runs costs one index line rather than a new
+    blob. index.jsonl records every fetch as (source, url, sha256, fetched_at).
+    """
+
+    def __init__(self, root, level=10):
+        self.root = Path(root)
+        self.blobs = self.root / "blobs"
+        self.index_path = self.root / "index.jsonl"
+        self.level = level
+        self.lock = threading.Lock()
+
+    def _blob_path(self, digest):
+        return self.blobs / digest[:2] / f"{digest}.html.zst"
+
+    def save(self, source, url, html, fetched_at=None):
+        """Archive a page and return its digest"""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        entry = {
+            "source": source,
+            "url": url,
+            "sha256": digest,
+            "fetched_at": (fetched_at or datetime.utcnow()).isoformat(),
+        }
+
+        with self.lock:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(zstandard.ZstdCompressor(level=self.level).compress(data))
+                tmp.replace(path)
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        return digest
+
+    def load(self, digest):
+        """Return the archived page for a digest"""
+        data = zstandard.ZstdDecompressor().decompress(self._blob_path(digest).read_bytes())
+        return data.decode("utf-8")
+
+    def entries(self, source=None, since=None, until=None):
+        """Yield index entries, optionally filtered by source and fetch time"""
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                fetched_at = datetime.fromisoformat(entry["fetched_at"])
+                if source and entry["source"] != source:
+                    continue
+                if since and fetched_at < since:
+                    continue
+                if until and fetched_at > until:
+                    continue
+                yield entry
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive():
+    """Shared archive at SNAPSHOT_CONFIG["path"]"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = SnapshotArchive(
+                SNAPSHOT_CONFIG.get("path", "snapshots"),
+                level=SNAPSHOT_CONFIG.get("level", 10),
+            )
+        return _archive
+
+
+def archive_page(source, url, html):
+    """Archive a fetched page unless snapshots are disabled; never fails the scrape"""
+    if not SNAPSHOT_CONFIG.get("enabled", True) or not html:
+        return None
+    try:
+        return get_archive().save(source, url, html)
+    except Exception as e:
+        print(f"⚠️ Snapshot archive error: {e}")
+        return None
@@ -0,0 +1,167 @@
+"""Deadlines and circuit breakers for scraper runs.
+
+A worker thread can't be killed, so deadlines are cooperative: the
+orchestrator sets one for the thread before a scraper is built, the scraper
+captures it, and every fetch checks it and caps its own page timeouts by the
+time left. Sources that keep failing are skipped by later runs until their
+breaker's cooldown has passed; the state lives in a JSON file so it survives
+restarts.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from config import ORCHESTRATOR_CONFIG
+except ImportError:
+    ORCHESTRATOR_CONFIG = {}
+
+DEFAULT_PAGE_TIMEOUT = 60          # seconds per page load
+DEFAULT_FAILURE_THRESHOLD = 3      # consecutive failed runs before a breaker opens
+DEFAULT_BREAKER_COOLDOWN = 6 * 3600
+DEFAULT_BREAKER_PATH = "breaker_state.json"
+TRIP_HISTORY = 10
+
+_local = threading.local()
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+@contextmanager
+def deadline(seconds):
+    """Give scrapers built in this thread `seconds` to finish (None = no deadline)"""
+    previous = getattr(_local, "deadline", None)
+    _local.deadline = time.monotonic() + seconds if seconds is not None else None
+    try:
+        yield _local.deadline
+    finally:
+        _local.deadline = previous
+
+
+def current_deadline():
+    """Monotonic deadline set for this thread, or None"""
+    return getattr(_local, "deadline", None)
+
+
+def time_left(deadline_at, cap=None):
+    """Seconds until deadline_at (at most cap); raises DeadlineExceeded once it has passed"""
+    if deadline_at is None:
+        return cap
+    left = deadline_at - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("scraper deadline exceeded")
+    return min(left, cap) if cap is not None else left
+
+
+@contextmanager
+def waiting_for(what):
+    """Report a blocking wait cut short by its deadline timeout as DeadlineExceeded"""
+    try:
+        yield
+    except TimeoutError as e:
+        raise DeadlineExceeded(f"scraper deadline exceeded waiting for {what}") from e
+
+
+def page_timeout():
+    return ORCHESTRATOR_CONFIG.get("page_timeout", DEFAULT_PAGE_TIMEOUT)
+
+
+class CircuitBreaker:
+    """Per-source breaker persisted to a JSON file.
+
+    A source's breaker opens after failure_threshold consecutive failed runs
+    and stays open for cooldown seconds. After that one trial run is allowed:
+    success closes the breaker, another failure re-opens it straight away.
+    Each trip is kept with its reason.
+    """
+
+    def __init__(self, path=DEFAULT_BREAKER_PATH, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 cooldown=DEFAULT_BREAKER_COOLDOWN):
+        self.path = Path(path)
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except ValueError:
+            print(f"⚠️ Ignoring unreadable breaker state in {self.path}")
+            return {}
+
+    def _save(self, state):
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        tmp.replace(self.path)
+
+    @staticmethod
+    def _entry(state, source):
+        return state.setdefault(source, {"failures": 0, "opened_at": None, "reason": None, "trips": []})
+
+    def allow(self, source):
+        """(allowed, reason): False while the source's breaker is open"""
+        with self._lock:
+            entry = self._load().get(source)
+        if not entry or entry["opened_at"] is None:
+            return True, None
+        retry_in = entry["opened_at"] + self.cooldown - time.time()
+        if retry_in > 0:
+            return False, f"circuit open ({entry['reason']}); retrying in {retry_in / 60:.0f} min"
+        return True, None
+
+    def record_success(self, source):
+        with self._lock:
+            state = self._load()
+            entry = self._entry(state, source)
+            entry["failures"] = 0
+            entry["opened_at"] = None
+            entry["reason"] = None
+            self._save(state)
+
+    def record_failure(self, source, reason):
+        """Count a failed run; returns True if this opened the breaker"""
+        with self._lock:
+            state = self._load()
+            entry = self._entry(state, source)
+            entry["failures"] += 1
+            was_trial = entry["opened_at"] is not None
+            tripped = was_trial or entry["failures"] >= self.failure_threshold
+            if tripped:
+                entry["opened_at"] = time.time()
+                entry["reason"] = reason
+                entry["trips"] = (entry["trips"] + [{
+                    "at": datetime.now().isoformat(timespec="seconds"),
+                    "reason": reason,
+                    "failures": entry["failures"],
+                }])[-TRIP_HISTORY:]
+            self._save(state)
+            return tripped
+
+    def status(self):
+        """Breaker state per source, as stored"""
+        with self._lock:
+            return self._load()
+
+
+_breaker = None
+_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker():
+    """Shared breaker configured from ORCHESTRATOR_CONFIG"""
+    global _breaker
+    with _breaker_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker(
+                ORCHESTRATOR_CONFIG.get("breaker_path", DEFAULT_BREAKER_PATH),
+                failure_threshold=ORCHESTRATOR_CONFIG.get("failure_threshold", DEFAULT_FAILURE_THRESHOLD),
+                cooldown=ORCHESTRATOR_CONFIG.get("breaker_cooldown", DEFAULT_BREAKER_COOLDOWN),
+            )
+        return _breaker
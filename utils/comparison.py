@@ -0,0 +1,99 @@
+import pandas as pd
+
+GROUP_KEYS = ['source', 'brand', 'model', 'condition']
+PRICE_STATS = ('latest', 'min', 'median')
+SUMMARY_COLUMNS = GROUP_KEYS + ['latest', 'min', 'median', 'rows', 'last_seen']
+
+
+def summarize_prices(df):
+    """One row per (source, brand, model, condition) with its latest, min and median price.
+
+    Hash-grouped, so it runs in time linear in the number of rows.
+    """
+    if df.empty:
+        empty = pd.DataFrame(columns=SUMMARY_COLUMNS)
+        return empty.astype({'latest': float, 'min': float, 'median': float, 'rows': int})
+
+    grouped = df.groupby(GROUP_KEYS, sort=False)
+    summary = grouped['price'].agg(['min', 'median', 'size']).rename(columns={'size': 'rows'})
+
+    # Latest = most recently scraped; rows from one batch share a timestamp, so
+    # ties go to the newest row
+    newest = df[df['date_scraped'] == grouped['date_scraped'].transform('max')]
+    if 'id' in newest.columns:
+        newest = newest.loc[newest.groupby(GROUP_KEYS, sort=False)['id'].idxmax()]
+    else:
+        newest = newest.drop_duplicates(GROUP_KEYS, keep='last')
+    latest = newest[GROUP_KEYS + ['price', 'date_scraped']].set_index(GROUP_KEYS)
+    latest = latest.rename(columns={'price': 'latest', 'date_scraped': 'last_seen'})
+
+    return summary.join(latest).reset_index()[SUMMARY_COLUMNS]
+
+
+def compare_to_baseline(df, baseline='Maple', stat='latest', match_condition=False):
+    """Price of every other source's devices relative to the baseline source's.
+
+    Both sides are reduced with summarize_prices before joining, so each
+    competitor row meets at most one baseline row per condition rather than
+    every historical baseline price. Devices are matched on brand and model,
+    and on condition too with match_condition=True. Returns one row per
+    competitor device (and baseline condition) with price, baseline_price
+    and percent_diff, all taken from the chosen stat.
+    """
+    if stat not in PRICE_STATS:
+        raise ValueError(f"stat must be one of {PRICE_STATS}, got {stat!r}")
+
+    summary = summarize_prices(df)
+    keys = ['brand', 'model'] + (['condition'] if match_condition else [])
+
+    base = summary[summary['source'] == baseline]
+    base = base[['brand', 'model', 'condition', stat]].rename(
+        columns={stat: 'baseline_price', 'condition': 'baseline_condition'}
+    )
+    if match_condition:
+        base['condition'] = base['baseline_condition']
+
+    others = summary[summary['source'] != baseline]
+    comparison = others.merge(base, on=keys, how='inner')
+    comparison['price'] = comparison[stat]
+    comparison['percent_diff'] = (
+        (comparison['price'] - comparison['baseline_price']) / comparison['baseline_price'] * 100
+    ).round(2)
+
+    return comparison[[
+        'source', 'brand', 'model', 'condition', 'baseline_condition',
+        'price', 'baseline_price', 'percent_diff', 'latest', 'min', 'median', 'rows', 'last_seen',
+    ]]
+
+
+SUGGESTION_COLUMNS = [
+    'brand', 'model', 'condition', 'best_source', 'price', 'baseline_price',
+    'percent_diff', 'sell_to', 'suggestion',
+]
+
+
+def best_price_suggestions(comparison, baseline):
+    """Best other-source offer per (brand, model, condition) and where to sell.
+
+    sell_to is the best source when it beats the baseline and the baseline
+    otherwise; suggestion is the same advice as text. Computed with one
+    groupby and column-wise string operations, no per-row Python.
+    """
+    comparison = comparison.dropna(subset=['percent_diff'])
+    if comparison.empty:
+        return pd.DataFrame(columns=SUGGESTION_COLUMNS)
+
+    best = comparison.loc[
+        comparison.groupby(['brand', 'model', 'condition'], sort=False)['percent_diff'].idxmax()
+    ].rename(columns={'source': 'best_source'})
+
+    beats_baseline = best['percent_diff'] > 0
+    gap = best['percent_diff'].abs().round(1).astype(str) + '%'
+    prices = ' (₹' + best['price'].astype(str) + ' vs ₹' + best['baseline_price'].astype(str) + ')'
+
+    best['sell_to'] = best['best_source'].where(beats_baseline, baseline)
+    best['suggestion'] = (
+        ('Sell to ' + best['best_source'] + ': ' + gap + ' higher than ' + baseline + prices)
+        .where(beats_baseline, baseline + ' offers a better price by ' + gap)
+    )
+    return best[SUGGESTION_COLUMNS].reset_index(drop=True)
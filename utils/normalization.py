@@ -1,73 +1,166 @@
 import re
+from functools import lru_cache
 
+# Raw titles repeat heavily across pages, variants and runs
+CACHE_SIZE = 16384
+
+BRAND_MAPPINGS = {
+    'apple': 'Apple',
+    'samsung': 'Samsung',
+    'oneplus': 'OnePlus',
+    'xiaomi': 'Xiaomi',
+    'redmi': 'Xiaomi',
+    'oppo': 'OPPO',
+    'vivo': 'Vivo',
+    'realme': 'Realme',
+    'google': 'Google',
+    'nothing': 'Nothing',
+    'motorola': 'Motorola',
+    'nokia': 'Nokia',
+    'iqoo': 'iQOO',
+    'lava': 'Lava',
+    'zeno': 'Zeno',
+    'acer': 'Acer',
+    'honor': 'HONOR',
+    'poco': 'POCO'
+}
+
+BRAND_KEYWORDS = [
+    r'Apple', r'Samsung', r'OnePlus', r'Xiaomi', r'Redmi', r'OPPO',
+    r'Vivo', r'Realme', r'Google', r'Motorola', r'Nokia', r'Nothing',
+    r'iQOO', r'Lava', r'Zeno', r'Acer', r'Honor', r'POCO'
+]
+
+# First matching rule wins; anything else is just capitalized
+CONDITION_RULES = [
+    (('excellent', 'mint', 'like new'), 'Excellent'),
+    (('good', 'very good', 'great'), 'Good'),
+    (('fair', 'average', 'ok'), 'Fair'),
+    (('poor', 'damaged'), 'Poor'),
+    (('refurbished',), 'Refurbished'),
+]
+
+# Common wrappers in front of a title, e.g. "(Refurbished) Apple ..."
+_WRAPPER_RE = re.compile(r'^\(?(refurbished|renewed|pre[-\s]?owned|used)\)?')
+
+_CONDITION_WORDS_RE = re.compile(r'\b(Refurbished|Renewed|Pre[-\s]?Owned|Used)\b', re.IGNORECASE)
+
+# A leading parenthesised tag and/or a known brand, removed in one anchored match
+_PREFIX_RE = re.compile(
+    r'^(?:\s*\(.*?\)\s*)?(?:(?i:' + '|'.join(BRAND_KEYWORDS) + r')\s+)?'
+)
+
+# Whitespace runs and parentheses with the whitespace around them
+_SPACING_RE = re.compile(r'\s*([()])\s*|\s+')
+
+
+@lru_cache(maxsize=CACHE_SIZE)
 def normalize_brand(title):
     """Extract and normalize brand name from title"""
-    title = title.strip().lower()
-    mappings = {
-        'apple': 'Apple',
-        'samsung': 'Samsung',
-        'oneplus': 'OnePlus',
-        'xiaomi': 'Xiaomi',
-        'redmi': 'Xiaomi',
-        'oppo': 'OPPO',
-        'vivo': 'Vivo',
-        'realme': 'Realme',
-        'google': 'Google',
-        'nothing': 'Nothing',
-        'motorola': 'Motorola',
-        'nokia': 'Nokia',
-        'iqoo': 'iQOO',
-        'lava': 'Lava',
-        'zeno': 'Zeno',
-        'acer': 'Acer',
-        'honor': 'HONOR',
-        'poco': 'POCO'
-    }
-
-    # Remove common wrappers
-    title = re.sub(r'^\(?(refurbished|renewed|pre[-\s]?owned|used)\)?', '', title).strip()
-
+    title = _WRAPPER_RE.sub('', title.strip().lower(), count=1).strip()
     first_word = title.split()[0]
-    return mappings.get(first_word, first_word.title())
+    return BRAND_MAPPINGS.get(first_word, first_word.title())
 
 
 def normalize_condition(condition):
     if not condition or not isinstance(condition, str):
-        return 'Good'  
-    condition = condition.strip().lower()
-    if 'excellent' in condition or 'mint' in condition or 'like new' in condition:
-        return 'Excellent'
-    elif 'good' in condition or 'very good' in condition or 'great' in condition:
         return 'Good'
-    elif 'fair' in condition or 'average' in condition or 'ok' in condition:
-        return 'Fair'
-    elif 'poor' in condition or 'damaged' in condition:
-        return 'Poor'
-    elif "refurbished" in condition or 'Renewed' in condition:
-        return "Refurbished"
-    else:
-        return condition.capitalize()
+    return _normalize_condition(condition)
 
 
-def extract_model(device_name: str) -> str:
-    device_name = re.sub(r'\b(Refurbished|Renewed|Pre[-\s]?Owned|Used)\b', '', device_name, flags=re.IGNORECASE)
+@lru_cache(maxsize=CACHE_SIZE)
+def _normalize_condition(condition):
+    condition = condition.strip().lower()
+    for words, label in CONDITION_RULES:
+        if any(word in condition for word in words):
+            return label
+    return condition.capitalize()
+
 
-    # Remove any leading parentheses/brackets/tags
-    device_name = re.sub(r'^\s*\(.*?\)\s*', '', device_name)
+def _normalize_spacing(text):
+    """Single pass over whitespace and parentheses.
 
-    # Remove known brands
-    brand_keywords = [
-        r'Apple', r'Samsung', r'OnePlus', r'Xiaomi', r'Redmi', r'OPPO',
-        r'Vivo', r'Realme', r'Google', r'Motorola', r'Nokia', r'Nothing',
-        r'iQOO', r'Lava', r'Zeno', r'Acer', r'Honor', r'POCO'
-    ]
-    pattern = r'^(' + '|'.join(brand_keywords) + r')\s+'
-    device_name = re.sub(pattern, '', device_name, flags=re.IGNORECASE)
+    "(" gets exactly one space in front, except straight after ")", ")" sheds
+    the whitespace on both sides and any other run collapses to one space.
+    """
+    parts = []
+    pos = 0
+    after_close = -1
+    for match in _SPACING_RE.finditer(text):
+        parts.append(text[pos:match.start()])
+        paren = match.group(1)
+        if paren == '(':
+            parts.append('(' if match.start() == after_close else ' (')
+        elif paren == ')':
+            parts.append(')')
+            after_close = match.end()
+        else:
+            parts.append(' ')
+        pos = match.end()
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def extract_model(device_name: str) -> str:
+    device_name = _CONDITION_WORDS_RE.sub('', device_name)
+
+    # Remove any leading parentheses/brackets/tags, then a known brand
+    device_name = _PREFIX_RE.sub('', device_name, count=1)
 
     # Clean up whitespaces and stray punctuation
-    device_name = re.sub(r'\s*\(\s*', ' (', device_name)
-    device_name = re.sub(r'\s*\)\s*', ')', device_name)
-    device_name = re.sub(r'\s+', ' ', device_name)
+    device_name = _normalize_spacing(device_name)
     device_name = device_name.strip(' -')
 
     return device_name.strip()
+
+
+# Whole-column versions of normalize_brand and normalize_condition, for
+# re-normalizing stored rows. They must give the same result as the scalar
+# functions for every value.
+
+def normalize_brand_series(titles):
+    """Vectorized normalize_brand; values it can't normalize are left unchanged"""
+    first_words = (
+        titles.str.strip().str.lower()
+        .str.replace(_WRAPPER_RE, '', n=1, regex=True)
+        .str.strip().str.split().str[0]
+    )
+    brands = first_words.map(BRAND_MAPPINGS).fillna(first_words.str.title())
+    return brands.where(first_words.notna(), titles)
+
+
+def normalize_condition_series(conditions):
+    """Vectorized normalize_condition"""
+    lowered = conditions.fillna('').str.strip().str.lower()
+    result = lowered.str.capitalize()
+    # Apply rules lowest priority first so the first matching rule ends up on top
+    for words, label in reversed(CONDITION_RULES):
+        matched = lowered.str.contains('|'.join(map(re.escape, words)), regex=True)
+        result = result.mask(matched, label)
+    return result.mask(conditions.isna() | (conditions == ''), 'Good')
+
+
+def cache_stats():
+    """Hit/miss counts and sizes of the normalization caches"""
+    stats = {}
+    for name, fn in (
+        ('normalize_brand', normalize_brand),
+        ('normalize_condition', _normalize_condition),
+        ('extract_model', extract_model),
+    ):
+        info = fn.cache_info()
+        stats[name] = {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'maxsize': info.maxsize,
+        }
+    return stats
+
+
+def clear_caches():
+    """Drop cached results, e.g. after changing the normalization rules at runtime"""
+    normalize_brand.cache_clear()
+    _normalize_condition.cache_clear()
+    extract_model.cache_clear()